@@ -639,7 +639,8 @@ class Mod_Details(OneItemLink):
     def Execute(self):
         with balt.Progress(_(u'Details')) as progress:
             sel_info_data = ModHeaderReader.extract_mod_data(
-                self._selected_info, SubProgress(progress, 0.1, 0.7))
+                self._selected_info, SubProgress(progress, 0.1, 0.7),
+                validate=False)
             buff = []
             complex_groups = bush.game.complex_groups
             progress(0.7, _('Sorting records.'))
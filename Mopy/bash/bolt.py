@@ -1412,6 +1412,15 @@ def flag(index: int | None) -> bool:
     """Type erasing method for assigning Field index values."""
     return index    # type: ignore
 
+class _FlagProperty(property):
+    """Property reading a single bit of a Flags instance. Remembers how the
+    flag was declared, so that Flags subclasses can redo the index
+    computation."""
+    def __init__(self, index: int, flag_override):
+        super().__init__(lambda flags_inst: (flags_inst._field >> index) & 1
+                                            == 1)
+        self.flag_override = flag_override
+
 class Flags:
     """Represents a flag field.  New Flags classes are defined by subclassing.
 
@@ -1434,8 +1443,12 @@ def __init_subclass__(cls, *args, **kwargs):
         current_index = 0
         hints = get_type_hints(cls)
         hints = ((att, hint) for att, hint in hints.items() if hint is bool)
+        flag_props = {}
         for attr, hint in hints: # we're only considering the 'bool' hints
             override = getattr(cls, attr, _not_a_flag)
+            if isinstance(override, _FlagProperty):
+                # Inherited from a parent Flags class, use its declaration
+                override = override.flag_override
             if override is not _not_a_flag:
                 if override is None:
                     # None indicates just increment the index
@@ -1452,13 +1465,19 @@ def __init_subclass__(cls, *args, **kwargs):
                     raise TypeError(f'{cls.__name__} flag field index must '
                                     f'be an integer or None, got {override!r}')
             names_dict[attr] = current_index
+            flag_props[attr] = _FlagProperty(current_index, override)
             current_index += 1
         cls._names = names_dict
+        # Reading flags is very common, so give each flag a property of its
+        # own instead of going through a __getattribute__ override - that
+        # would slow down every single attribute access on Flags instances
+        for attr, flag_prop in flag_props.items():
+            setattr(cls, attr, flag_prop)
 
     #--Generation
     def __init__(self, value: int | Self = 0):
         """Set the internal int value."""
-        object.__setattr__(self, u'_field', int(value))
+        _set_flags_field(self, int(value))
 
     def __call__(self,newValue=None): ##: ideally drop in favor of copy (explicit)
         """Returns a clone of self, optionally with new value."""
@@ -1500,21 +1519,11 @@ def __setitem__(self,index,value):
         """Set value by index. E.g., flags[3] = True"""
         value = ((value or 0) and 1) << index
         mask = 1 << index
-        self._field = ((self._field & ~mask) | value)
+        _set_flags_field(self, (self._field & ~mask) | value)
 
     #--As class
-    def __getattribute__(self, attr_key: str):
-        """Get value by flag name. E.g. flags.isQuestItem.
-        Since some flag names may have values set on the class itself via
-        `flagname = flag(bit)`, we can't use __getattr__ as accessing these
-        won't raise AttributeError (which leads to __getattr__ being called).
-        """
-        try:
-            index = type(self)._names[attr_key]
-            return (super().__getattribute__('_field') >> index) & 1 == 1
-        except KeyError:
-            return super().__getattribute__(attr_key)
-
+    # Getting values by flag name (e.g. flags.isQuestItem) is handled by the
+    # properties created in __init_subclass__
     def __setattr__(self, attr_key, value):
         """Set value by flag name. E.g., flags.isQuestItem = False"""
         if attr_key == u'_field':
@@ -1567,6 +1576,10 @@ def __repr__(self):
         all_flags = u', '.join(self.getTrueAttrs()) if self._field else u'None'
         return f'0x{self.hex()} ({all_flags})'
 
+# Flags are created for every flag field of every loaded record, so set their
+# value straight through the slot instead of going through Flags.__setattr__
+_set_flags_field = Flags._field.__set__
+
 class TrimmedFlags(Flags):
     """Flags subtype that will discard unnamed flags on __init__ and dump."""
     __slots__ = ()
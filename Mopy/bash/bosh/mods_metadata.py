@@ -43,37 +43,33 @@ def get_tags_from_dir(plugin_name, ci_cached_bt_contents=None):
         directory. If specified, get_tags_from_dir avoids having to stat to
         figure out if the file in question exists.
     :return: A tuple containing two sets of added and deleted tags."""
-    tag_file = None
     # Check if the file even exists first, using the cache if possible
     bt_file_name = f'{plugin_name.fn_body}.txt'
-    if ci_cached_bt_contents is not None:
-        if bt_file_name.lower() not in ci_cached_bt_contents:
-            return set(), set()
-    else:
-        tag_file = bass.dirs['tag_files'].join(bt_file_name)
-        if not tag_file.is_file():
-            return set(), set()
-    if tag_file is None: # If we hit the cache, we need to set tag_file here
-        tag_file = bass.dirs['tag_files'].join(bt_file_name)
+    if (ci_cached_bt_contents is not None and
+            bt_file_name.lower() not in ci_cached_bt_contents):
+        return set(), set()
+    # Otherwise just try to read it - cheaper than a stat followed by an open
+    try:
+        # BashTags files must be in UTF-8 (or ASCII, obviously)
+        with bass.dirs['tag_files'].join(bt_file_name).open(
+                'r', encoding='utf-8') as ins:
+            tag_data = ins.read()
+    except OSError: # missing, a directory, not readable, etc.
+        return set(), set()
     removed, added = set(), set()
     add_removed = removed.add
     add_added = added.add
-    # BashTags files must be in UTF-8 (or ASCII, obviously)
-    with tag_file.open(u'r', encoding=u'utf-8') as ins:
-        for tag_line in ins:
-            # Strip out comments and skip lines that are empty as a result
-            tag_line = tag_line.split(u'#')[0].strip()
-            if not tag_line: continue
-            for tag_entry in tag_line.split(u','):
-                # Guard against things (e.g. typos) like 'TagA,,TagB'
-                if not tag_entry: continue
-                tag_entry = tag_entry.strip()
-                # If it starts with a minus, it's removing a tag
-                if tag_entry[0] == u'-':
-                    # Guard against a typo like '- C.Water'
-                    add_removed(tag_entry[1:].strip())
-                else:
-                    add_added(tag_entry)
+    for tag_line in tag_data.splitlines():
+        # Strip out comments, empty entries are skipped below
+        for tag_entry in tag_line.split('#', 1)[0].split(','):
+            # Guard against things (e.g. typos) like 'TagA,,TagB' or 'TagA, '
+            if not (tag_entry := tag_entry.strip()): continue
+            # If it starts with a minus, it's removing a tag
+            if tag_entry[0] == '-':
+                # Guard against a typo like '- C.Water'
+                add_removed(tag_entry[1:].strip())
+            else:
+                add_added(tag_entry)
     return added, removed
 
 def save_tags_to_dir(plugin_name, plugin_tag_diff):
@@ -90,8 +86,10 @@ def save_tags_to_dir(plugin_name, plugin_tag_diff):
     tag_file = tag_files_dir.join(f'{plugin_name.fn_body}.txt')
     # Calculate the diff and ignore the minus when sorting the result
     tag_diff_add, tag_diff_del = plugin_tag_diff
-    processed_diff = sorted(tag_diff_add | {u'-' + t for t in tag_diff_del},
-                            key=lambda t: t[1:] if t[0] == u'-' else t)
+    sorted_diff = [(t, t) for t in tag_diff_add]
+    sorted_diff.extend((t, f'-{t}') for t in tag_diff_del)
+    sorted_diff.sort()
+    processed_diff = [t for _sort_key, t in sorted_diff]
     # While all our tags are ASCII, the comment at the top can be localized, so
     # use UTF-8
     with tag_file.open(u'w', encoding=u'utf-8') as out:
@@ -110,6 +108,13 @@ def diff_tags(plugin_new_tags, plugin_old_tags):
 _cleaning_wiki_url = (u'[[!https://tes5edit.github.io/docs/7-mod-cleaning-and'
                       u'-error-checking.html|Tome of xEdit]]')
 
+def _unflatten_versions(flat_versions: list, full_acti) -> list[tuple]:
+    """Turn a flattened list of record versions, as collected by checkMods,
+    back into a list of (eid, sig, plugin) tuples."""
+    versions_iter = iter(flat_versions)
+    return [(v_eid, v_sig, full_acti[v_acti_index]) for v_eid, v_sig,
+            v_acti_index in zip(versions_iter, versions_iter, versions_iter)]
+
 def checkMods(progress, modInfos, showModList=False, showCRC=False,
               showVersion=True, scan_plugins=True):
     """Checks currently loaded mods for certain errors / warnings."""
@@ -123,6 +128,9 @@ def checkMods(progress, modInfos, showModList=False, showCRC=False,
     all_present_plugins = set(full_lo)
     all_present_minfs = {x: modInfos[x] for x in full_lo}
     all_active_plugins = set(full_acti)
+    # Bash tags are needed in more than one check below, fetch them only once
+    plugin_tags = {k: frozenset(m.getBashTags()) for k, m in
+                   all_present_minfs.items()}
     game_master_name = bush.game.master_file
     vanilla_masters = bush.game.bethDataFiles
     log = bolt.LogFile(io.StringIO())
@@ -142,7 +150,7 @@ def checkMods(progress, modInfos, showModList=False, showCRC=False,
     # Don't show NoMerge-tagged plugins as mergeable and remove ones that have
     # already been merged into a BP
     for m in list(can_merge):
-        if 'NoMerge' in modInfos[m].getBashTags() or m in modInfos.merged:
+        if 'NoMerge' in plugin_tags[m] or m in modInfos.merged:
             can_merge.discard(m)
     # -------------------------------------------------------------------------
     # Check for ESL-flagged plugins that aren't ESL-capable and Overlay-flagged
@@ -169,10 +177,9 @@ def checkMods(progress, modInfos, showModList=False, showCRC=False,
     # MustBeActiveIfImported-tagged plugins that are imported, but inactive.
     should_deactivate = []
     should_activate = []
-    for plugin_fn, p_minf in all_present_minfs.items():
+    for plugin_fn, p_tags in plugin_tags.items():
         p_active = plugin_fn in all_active_plugins
         p_imported = plugin_fn in modInfos.imported
-        p_tags = p_minf.getBashTags()
         if u'Deactivate' in p_tags and p_active:
             should_deactivate.append(plugin_fn)
         if u'MustBeActiveIfImported' in p_tags and not p_active and p_imported:
@@ -188,32 +195,29 @@ def checkMods(progress, modInfos, showModList=False, showCRC=False,
         if p.has_circular_masters():
             # The plugin depends on itself (possibly transitively) -> report
             p_circular_masters.add(p_fn_key)
+        p_masters = p.masterNames
         if p_fn_key in all_active_plugins:
-            for p_master in p.masterNames:
+            for p_master in p_masters:
                 if p_master not in all_present_plugins:
                     # The plugin is active and a master is missing -> report
                     p_missing_masters.add(p_fn_key)
-                else:
-                    if p_master not in seen_plugins:
-                        # The plugin is active and one of its masters hasn't
-                        # been checked, so that master is delinquent -> report
-                        p_delinquent_masters.add(p_fn_key)
-                    if p_master not in all_active_plugins:
-                        # Inactive master -> needed for scanning later
-                        cannot_scan_overrides.add(p_fn_key)
-        else:
-            for p_master in p.masterNames:
-                if p_master not in all_active_plugins:
-                    # Inactive master -> needed for scanning later
-                    cannot_scan_overrides.add(p_fn_key)
+                elif p_master not in seen_plugins:
+                    # The plugin is active and one of its masters hasn't been
+                    # checked (i.e. it loads after the plugin), so that master
+                    # is delinquent -> report
+                    p_delinquent_masters.add(p_fn_key)
+        # Inactive (or missing) master -> needed for scanning later
+        if not all_active_plugins.issuperset(p_masters):
+            cannot_scan_overrides.add(p_fn_key)
+        # Only add the plugin once we're done with it, see delinquent check
         seen_plugins.add(p_fn_key)
-    cannot_scan_overrides |= p_missing_masters
     # -------------------------------------------------------------------------
     # Check for plugins with invalid TES4 version.
     valid_vers = bush.game.Esp.validHeaderVersions
-    invalid_tes4_versions = {x: u'%s' % modInfos[x].header.version for x in
-                             all_active_plugins if all(
-            modInfos[x].header.version != v for v in valid_vers)}
+    invalid_tes4_versions = {}
+    for x in all_active_plugins:
+        if (x_ver := all_present_minfs[x].header.version) not in valid_vers:
+            invalid_tes4_versions[x] = f'{x_ver}'
     # -------------------------------------------------------------------------
     # Check for older form versions, which may point to improperly converted
     # plugins
@@ -222,13 +226,11 @@ def checkMods(progress, modInfos, showModList=False, showCRC=False,
     # Check for cleaning information from LOOT.
     cleaning_messages = {}
     scan_for_cleaning = set()
-    dirty_msgs = [(k, m.getDirtyMessage(scan_beth=True)) for k, m in
-                  all_present_minfs.items()]
     num_dirty_vanilla = 0
-    for x, y in dirty_msgs:
-        if y:
-            if isinstance(y, str):
-                cleaning_messages[x] = y
+    for x, x_minf in all_present_minfs.items():
+        if dirty_msg := x_minf.getDirtyMessage(scan_beth=True):
+            if isinstance(dirty_msg, str):
+                cleaning_messages[x] = dirty_msg
             else: # Don't report vanilla plugins if the ignore setting is on
                 num_dirty_vanilla += 1
         elif scan_plugins:
@@ -236,43 +238,58 @@ def checkMods(progress, modInfos, showModList=False, showCRC=False,
     # -------------------------------------------------------------------------
     # Scan plugins to collect data for more detailed analysis.
     scanning_canceled = False
-    all_unneeded_deletions = defaultdict(list) # fn_key -> list[(fid, sig)]
-    all_deleted_refs = defaultdict(list) # fn_key -> list[fid]
-    all_deleted_navms = defaultdict(list) # fn_key -> list[fid]
-    all_deleted_others = defaultdict(list) # fn_key -> list[fid]
-    old_weapon_records = defaultdict(list) # fn_key -> list[fid]
-    null_formid_records = defaultdict(list) # fn_key -> list[(eid, sig)]
+    # Plugins only get an entry in these if they have something to report
+    all_unneeded_deletions = {} # fn_key -> list[(fid, sig)]
+    all_deleted_refs = {} # fn_key -> list[fid]
+    all_deleted_navms = {} # fn_key -> list[fid]
+    all_deleted_others = {} # fn_key -> list[fid]
+    old_weapon_records = {} # fn_key -> list[fid]
+    null_fids = {} # fn_key -> list[(sig, eid)] of records with NULL FormIDs
     plgn_header_sig = bush.game.Esp.plugin_header_sig
     # fid -> (is_injected, orig_plugin, list[(eid, sig, plugin)])
     record_type_collisions = {}
     # fid -> (orig_plugin, list[(eid, sig, plugin)])
     probable_injected_collisions = {}
-    duplicate_formids = defaultdict(dict) # fid -> plugin -> int
-    all_hitmes = defaultdict(list) # fn_key -> list[fid]
+    duplicate_formids = {} # fid -> plugin -> int
+    all_hitmes = {} # fn_key -> list[fid]
     if scan_plugins:
         try:
             # Extract data for all plugins (we'll need the context from all of
-            # them, even the game master)
-            load_progress = SubProgress(progress, 0, 0.7)
-            load_progress.setFull(len(all_present_minfs))
-            all_extracted_data = {}
-            for i, (k, present_minf) in enumerate(all_present_minfs.items()):
-                mod_progress = SubProgress(load_progress, i, i + 1)
-                ext_data = ModHeaderReader.extract_mod_data(present_minf,
-                                                            mod_progress)
-                all_extracted_data[k] = ext_data
-            # Run over all plugin data once for efficiency, collecing
-            # information such as deleted records and overrides
-            scan_progress = SubProgress(progress, 0.7, 0.9)
-            scan_progress.setFull(len(all_extracted_data))
+            # them, even the game master) and scan each one right away,
+            # collecting information such as deleted records and overrides.
+            # That way only one plugin's data is ever held in memory
+            scan_progress = SubProgress(progress, 0, 0.9)
+            scan_progress.setFull(len(all_present_minfs))
             all_ref_types = RecordType.sig_to_class[b'CELL'].ref_types
-            # Temporary place to collect (eid, sig, plugin)-lists
+            # Temporary place to collect record versions. These are stored
+            # flattened, i.e. as [eid1, sig1, plugin1, eid2, sig2, ...], which
+            # saves us from creating a tuple for each of the millions of
+            # records we scan. Plugins are stored as their index in the active
+            # load order, which is much cheaper to compare
             all_record_versions: dict[int, list] = defaultdict(list)
             # Whether or not the game uses SSE's form version (44)
             game_has_v44 = RecordHeader.plugin_form_version == 44
-            for i, (plugin_fn, ext_data) in enumerate(
-                    all_extracted_data.items()):
-                scan_progress(i, (_(u'Scanning: %s') % plugin_fn))
+            per_plugin_colls = (all_unneeded_deletions, all_deleted_refs,
+                all_deleted_navms, all_deleted_others, old_weapon_records,
+                all_hitmes, null_fids)
+            ##: This is embarrassingly parallel in theory, but neither a
+            # process nor a thread pool is an option right now: FormIDs are
+            # created against the global utils_constants.FORM_ID context that
+            # the readers set up, workers would need bush.game and the
+            # RecordHeader config replicated and the progress bar can only be
+            # driven from this thread. Revisit once FORM_ID is per-reader
+            ##: Caching the extracted data across runs (keyed on size/mtime)
+            # would need a picklable representation first - FormIds refuse
+            # to be pickled and the scan results depend on the load order, so
+            # we'd have to store raw (fid, sig, flags, eid) rows per plugin,
+            # which is about as big as the record headers themselves
+            for i, (plugin_fn, present_minf) in enumerate(
+                    all_present_minfs.items()):
+                # Loading takes up most of each plugin's share of progress
+                plugin_progress = SubProgress(scan_progress, i, i + 1)
+                ext_data = ModHeaderReader.extract_mod_data(present_minf,
+                    SubProgress(plugin_progress, 0, 0.8))
+                plugin_progress(0.8, _('Scanning: %s') % plugin_fn)
                 # Two situations where we can skip checking deleted records:
                 # 1. The game master can't have deleted records (deleting a
                 #    record from the master file that introduced it just
@@ -296,50 +313,64 @@ def checkMods(progress, modInfos, showModList=False, showCRC=False,
                 # couldn't be fixed even if they did)
                 scan_old_weapons = (game_has_v44 and
                                     plugin_fn not in vanilla_masters)
-                add_unneeded_del = all_unneeded_deletions[plugin_fn].append
-                add_deleted_ref = all_deleted_refs[plugin_fn].append
-                add_deleted_navm = all_deleted_navms[plugin_fn].append
-                add_deleted_rec = all_deleted_others[plugin_fn].append
-                add_old_weapon = old_weapon_records[plugin_fn].append
-                add_hitme = all_hitmes[plugin_fn].append
-                add_null_fid = null_formid_records[plugin_fn].append
-                p_masters = (*modInfos[plugin_fn].masterNames, plugin_fn)
-                p_num_masters = len(p_masters)
-                for r, d in ext_data.items():
-                    for r_fid, (r_header, r_eid) in d.items():
+                # Collect into local lists, only stored if they end up used
+                p_results = [[] for _pc in per_plugin_colls]
+                (add_unneeded_del, add_deleted_ref, add_deleted_navm,
+                 add_deleted_rec, add_old_weapon, add_hitme,
+                 add_null_fid) = [p_res.append for p_res in p_results]
+                p_masters = (*present_minf.masterNames, plugin_fn)
+                # Index of the plugin itself in p_masters, anything above it
+                # is a HITME - precomputed so we don't redo it per record
+                p_own_index = len(p_masters) - 1
+                if scan_overrides:
+                    p_acti_index = plugin_to_acti_index[plugin_fn]
+                    # Maps each of this plugin's mod indices to the (already
+                    # shifted) mod index it has in the whole LO - all masters
+                    # are active if we're scanning overrides
+                    p_lo_mod_dexes = [plugin_to_acti_index[m] << 24
+                                      for m in p_masters]
+                for sig_records in ext_data.values():
+                    for r_fid, (r_header, r_eid) in sig_records.items():
                         w_rec_type = r_header.recType
-                        if (r_fid.object_dex == 0 and
+                        # Work on the raw short FormID - the object_dex and
+                        # mod_dex properties are too slow for this loop
+                        r_short_fid = r_fid.short_fid
+                        r_object_dex = r_short_fid & 0x00FFFFFF
+                        if (r_object_dex == 0 and
                                 w_rec_type != plgn_header_sig):
                             add_null_fid((w_rec_type, r_eid))
-                        r_mod_index = r_fid.mod_dex
+                        r_mod_index = r_short_fid >> 24
                         if scan_deleted:
                             # Check the deleted flag - unpacking flags is too
                             # expensive
                             if r_header.flags1 & 0x00000020:
-                                if r_mod_index == p_num_masters - 1:
+                                if r_mod_index == p_own_index:
                                     add_unneeded_del((r_fid, w_rec_type))
-                                elif w_rec_type == b'NAVM':
-                                    add_deleted_navm(r_fid)
+                                # References are by far the most common
+                                # deleted records, so check for them first
                                 elif w_rec_type in all_ref_types:
                                     add_deleted_ref(r_fid)
+                                elif w_rec_type == b'NAVM':
+                                    add_deleted_navm(r_fid)
                                 else:
                                     add_deleted_rec(r_fid)
-                        # p_masters includes self, so >=
-                        is_hitme = r_mod_index >= p_num_masters
-                        if is_hitme:
+                        # p_masters includes self, so >
+                        if is_hitme := r_mod_index > p_own_index:
                             add_hitme(r_fid)
                         if scan_overrides:
                             # Convert into a load order FormID - ugly but fast,
                             # inlined and hand-optimized from various methods.
                             # Calling them would be way too slow.
-                            lo_fid = (r_fid.object_dex | plugin_to_acti_index[
-                                p_masters[p_num_masters - 1 if is_hitme else
-                                r_mod_index]] << 24)
-                            all_record_versions[lo_fid].append(
-                                (r_eid, r_header.recType, plugin_fn))
+                            lo_fid = r_object_dex | p_lo_mod_dexes[
+                                p_own_index if is_hitme else r_mod_index]
+                            all_record_versions[lo_fid].extend(
+                                (r_eid, w_rec_type, p_acti_index))
                         if (scan_old_weapons and w_rec_type == b'WEAP' and
                                 r_header.form_version < 44):
                             add_old_weapon(r_fid)
+                for p_coll, p_res in zip(per_plugin_colls, p_results):
+                    if p_res:
+                        p_coll[plugin_fn] = p_res
             # Check for record type collisions, i.e. overrides where the record
             # type of at least one override does not match the base record's
             # type and probable injected collisions, i.e. injected records
@@ -354,21 +385,25 @@ def checkMods(progress, modInfos, showModList=False, showCRC=False,
             num_collisions = 0
             collision_progress(num_collisions, prog_msg % game_master_name)
             for r_fid, r_versions in all_record_versions.items():
-                first_eid, first_sig, first_plugin = r_versions[0]
+                # The vast majority of records are never overridden, and a
+                # single version can't collide with or duplicate anything
+                if len(r_versions) == 3: continue
+                first_eid, first_sig, first_index = r_versions[:3]
                 duplicates_counter = Counter()
-                # These FormIDs are whole-LO and HITMEs are truncated, so this
-                # is safe
-                orig_plugin = full_acti[r_fid >> 24]
                 # Record versions are sorted by load order, so if the first
                 # version's originating plugin does not match the plugin that
-                # the whole-LO FormID points to, this record must be injected
-                is_injected = orig_plugin != first_plugin
+                # the whole-LO FormID points to, this record must be injected.
+                # These FormIDs are whole-LO and HITMEs are truncated, so the
+                # shift is safe
+                is_injected = r_fid >> 24 != first_index
                 definite_collision = False
                 probable_collision = False
-                duplicates_counter[first_plugin] = 1
-                for r_eid, r_sig, r_plugin in r_versions[1:]:
+                # No need to slice off the first version, it trivially matches
+                # itself
+                for r_eid, r_sig, r_index in zip(
+                        r_iter := iter(r_versions), r_iter, r_iter):
                     # Keep track of duplicate FormIDs in all record versions
-                    duplicates_counter[r_plugin] += 1
+                    duplicates_counter[r_index] += 1
                     if first_sig != r_sig:
                         # At least one override has a different record type,
                         # this is for sure a collision.
@@ -378,134 +413,122 @@ def checkMods(progress, modInfos, showModList=False, showCRC=False,
                         # has a different EDID, this is probably a collision.
                         probable_collision = True
                 # Keep only duplicate FormIDs when we actually have >1
-                trimmed_counter = {p: c for p, c in duplicates_counter.items()
-                                   if c > 1}
+                trimmed_counter = {full_acti[p]: c for p, c in
+                                   duplicates_counter.items() if c > 1}
                 if trimmed_counter:
                     duplicate_formids[r_fid] = trimmed_counter
-                if definite_collision:
-                    num_collisions += 1
-                    record_type_collisions[r_fid] = (is_injected, orig_plugin,
-                                                     r_versions)
-                    collision_progress(num_collisions, prog_msg % first_plugin)
-                elif probable_collision:
+                if definite_collision or probable_collision:
                     num_collisions += 1
-                    probable_injected_collisions[r_fid] = (orig_plugin,
-                                                           r_versions)
-                    collision_progress(num_collisions, prog_msg % first_plugin)
+                    orig_plugin = full_acti[r_fid >> 24]
+                    coll_versions = _unflatten_versions(r_versions, full_acti)
+                    if definite_collision:
+                        record_type_collisions[r_fid] = (is_injected,
+                            orig_plugin, coll_versions)
+                    else:
+                        probable_injected_collisions[r_fid] = (orig_plugin,
+                                                               coll_versions)
+                    collision_progress(num_collisions,
+                                       prog_msg % full_acti[first_index])
         except CancelError:
             scanning_canceled = True
     # -------------------------------------------------------------------------
     # Check for unnecessary deletions, i.e. new records that have the Deleted
     # flag set and should probably just be removed entirely instead
     unnecessary_dels = {}
-    if all_unneeded_deletions:
-        for plugin_fn, ud_data in all_unneeded_deletions.items():
-            # .esu files created by xEdit use deleted records on purpose to
-            # mark records that exist in one plugin but not in the other
-            plugin_is_esu = plugin_fn.fn_ext == '.esu'
-            if ud_data and not plugin_is_esu:
-                unnecessary_dels[plugin_fn] = ud_data
+    for plugin_fn, ud_data in all_unneeded_deletions.items():
+        # .esu files created by xEdit use deleted records on purpose to mark
+        # records that exist in one plugin but not in the other
+        if plugin_fn.fn_ext != '.esu':
+            unnecessary_dels[plugin_fn] = ud_data
     # -------------------------------------------------------------------------
     # Check for deleted references
-    if all_deleted_refs:
-        for plugin_fn, deleted_refrs in all_deleted_refs.items():
-            # Rely on LOOT for detecting deleted references in vanilla files
-            plugin_is_vanilla = plugin_fn in vanilla_masters
-            # .esu files created by xEdit use deleted records on purpose to
-            # mark records that exist in one plugin but not in the other
-            plugin_is_esu = plugin_fn.fn_ext == u'.esu'
-            if deleted_refrs and not plugin_is_vanilla and not plugin_is_esu:
-                num_deleted = len(deleted_refrs)
-                if num_deleted == 1: # I hate natural languages :/
-                    del_msg = _(u'1 deleted reference')
-                else:
-                    del_msg = _(u'%d deleted references') % num_deleted
-                cleaning_messages[plugin_fn] = del_msg
+    for plugin_fn, deleted_refrs in all_deleted_refs.items():
+        # Rely on LOOT for detecting deleted references in vanilla files
+        plugin_is_vanilla = plugin_fn in vanilla_masters
+        # .esu files created by xEdit use deleted records on purpose to mark
+        # records that exist in one plugin but not in the other
+        plugin_is_esu = plugin_fn.fn_ext == u'.esu'
+        if not plugin_is_vanilla and not plugin_is_esu:
+            num_deleted = len(deleted_refrs)
+            if num_deleted == 1: # I hate natural languages :/
+                del_msg = _(u'1 deleted reference')
+            else:
+                del_msg = _(u'%d deleted references') % num_deleted
+            cleaning_messages[plugin_fn] = del_msg
     # -------------------------------------------------------------------------
     # Check for deleted navmeshes
     deleted_navmeshes = {}
-    if all_deleted_navms:
-        for plugin_fn, deleted_navms in all_deleted_navms.items():
-            # Deleted navmeshes can't and shouldn't be fixed in vanilla files,
-            # so don't show warnings for them
-            plugin_is_vanilla = plugin_fn in vanilla_masters
-            # .esu files created by xEdit use deleted records on purpose to
-            # mark records that exist in one plugin but not in the other
-            plugin_is_esu = plugin_fn.fn_ext == u'.esu'
-            if deleted_navms and not plugin_is_vanilla and not plugin_is_esu:
-                num_deleted = len(deleted_navms)
-                if num_deleted == 1:
-                    del_msg = _(u'1 deleted navmesh')
-                else:
-                    del_msg = _(u'%d deleted navmeshes') % num_deleted
-                deleted_navmeshes[plugin_fn] = del_msg
+    for plugin_fn, deleted_navms in all_deleted_navms.items():
+        # Deleted navmeshes can't and shouldn't be fixed in vanilla files, so
+        # don't show warnings for them
+        plugin_is_vanilla = plugin_fn in vanilla_masters
+        # .esu files created by xEdit use deleted records on purpose to mark
+        # records that exist in one plugin but not in the other
+        plugin_is_esu = plugin_fn.fn_ext == u'.esu'
+        if not plugin_is_vanilla and not plugin_is_esu:
+            num_deleted = len(deleted_navms)
+            if num_deleted == 1:
+                del_msg = _(u'1 deleted navmesh')
+            else:
+                del_msg = _(u'%d deleted navmeshes') % num_deleted
+            deleted_navmeshes[plugin_fn] = del_msg
     # -------------------------------------------------------------------------
     # Check for deleted base records
     deleted_base_recs = {}
-    if all_deleted_others:
-        for plugin_fn, deleted_others in all_deleted_others.items():
-            # Deleted navmeshes can't and shouldn't be fixed in vanilla files,
-            # so don't show warnings for them
-            plugin_is_vanilla = plugin_fn in vanilla_masters
-            # .esu files created by xEdit use deleted records on purpose to
-            # mark records that exist in one plugin but not in the other
-            plugin_is_esu = plugin_fn.fn_ext == u'.esu'
-            if deleted_others and not plugin_is_vanilla and not plugin_is_esu:
-                num_deleted = len(deleted_others)
-                if num_deleted == 1:
-                    del_msg = _(u'1 deleted base record')
-                else:
-                    del_msg = _(u'%d deleted base records') % num_deleted
-                deleted_base_recs[plugin_fn] = del_msg
+    for plugin_fn, deleted_others in all_deleted_others.items():
+        # Deleted navmeshes can't and shouldn't be fixed in vanilla files, so
+        # don't show warnings for them
+        plugin_is_vanilla = plugin_fn in vanilla_masters
+        # .esu files created by xEdit use deleted records on purpose to mark
+        # records that exist in one plugin but not in the other
+        plugin_is_esu = plugin_fn.fn_ext == u'.esu'
+        if not plugin_is_vanilla and not plugin_is_esu:
+            num_deleted = len(deleted_others)
+            if num_deleted == 1:
+                del_msg = _(u'1 deleted base record')
+            else:
+                del_msg = _(u'%d deleted base records') % num_deleted
+            deleted_base_recs[plugin_fn] = del_msg
     # -------------------------------------------------------------------------
     # Check for old (form version < 44) WEAP records, which the game can't load
     # properly and which cannot be converted safely by the CK
     old_weaps = {}
-    if old_weapon_records:
-        for plugin_fn, weap_recs in old_weapon_records.items():
-            if weap_recs:
-                num_weaps = len(weap_recs)
-                if num_weaps == 1:
-                    weap_msg = _(u'1 old weapon record')
-                else:
-                    weap_msg = _(u'%d old weapon records') % num_weaps
-                old_weaps[plugin_fn] = weap_msg
-    # -------------------------------------------------------------------------
-    # Check for NULL FormIDs, i.e. records beside the main file header that
-    # have a FormID of 0x00000000
-    null_fids = {}
-    if null_formid_records:
-        for plugin_fn, null_data in null_formid_records.items():
-            if null_data:
-                null_fids[plugin_fn] = null_data
+    for plugin_fn, weap_recs in old_weapon_records.items():
+        num_weaps = len(weap_recs)
+        if num_weaps == 1:
+            weap_msg = _(u'1 old weapon record')
+        else:
+            weap_msg = _(u'%d old weapon records') % num_weaps
+        old_weaps[plugin_fn] = weap_msg
     # -------------------------------------------------------------------------
     # Check for HITMEs, i.e. records with a mod index that is > the number of
     # masters that the containing plugin has
     hitmes = {}
-    if all_hitmes:
-        for plugin_fn, found_hitmes in all_hitmes.items():
-            # HITMEs can't and shouldn't be fixed in vanilla files, so don't
-            # show warnings for them
-            plugin_is_vanilla = plugin_fn in vanilla_masters
-            if found_hitmes and not plugin_is_vanilla:
-                num_hitmes = len(found_hitmes)
-                # No point in making these translatable, HITME is a fixed term
-                if num_hitmes == 1:
-                    hitme_msg = u'1 HITME'
-                else:
-                    hitme_msg = u'%d HITMEs' % num_hitmes
-                hitmes[plugin_fn] = hitme_msg
+    for plugin_fn, found_hitmes in all_hitmes.items():
+        # HITMEs can't and shouldn't be fixed in vanilla files, so don't show
+        # warnings for them
+        if plugin_fn not in vanilla_masters:
+            num_hitmes = len(found_hitmes)
+            # No point in making these translatable, HITME is a fixed term
+            if num_hitmes == 1:
+                hitme_msg = u'1 HITME'
+            else:
+                hitme_msg = u'%d HITMEs' % num_hitmes
+            hitmes[plugin_fn] = hitme_msg
     # -------------------------------------------------------------------------
     # Some helpers for building the log
     p_header_str = sig_to_str(plgn_header_sig)
+    def log_lines(log_lines_):
+        """Logs several lines at once, far cheaper than one call per line."""
+        if log_lines_:
+            log('\n'.join(log_lines_))
     def log_plugins(plugin_list_):
         """Logs a simple list of plugins."""
-        for p in sorted(plugin_list_):
-            log(f'* __{p}__')
+        log_lines([f'* __{p}__' for p in sorted(plugin_list_)])
     def log_plugin_messages(plugin_dict):
         """Logs a list of plugins with a message after each plugin."""
-        for p, p_msg in dict_sort(plugin_dict):
-            log(f'* __{p}:__  {p_msg}')
+        log_lines([f'* __{p}:__  {p_msg}' for p, p_msg in
+                   dict_sort(plugin_dict)])
     def log_whole_lo_fid_note():
         """Log a note telling users that FormIDs in this section are relative
         to the whole LO, not individual plugins."""
@@ -540,17 +563,27 @@ def format_record(raw_sig: bytes, fmt_fid: str, raw_eid=''):
     if bush.game.has_esl:
         # Need to undo the offset we applied to sort ESLs after regulars
         sort_offset = load_order.max_espms() - 1
+        # Collisions and duplicates tend to come from the same few plugins, so
+        # cache the formatted index prefix for each plugin
+        fid_prefixes = {}
         def format_fid(whole_lo_fid, fid_orig_plugin):
             """Format a whole-LO FormID, which can exceed normal FormID limits
             (e.g. 211000800 is perfectly fine in a load order with ESLs), so
             that xEdit (and the game) can understand it."""
-            orig_minf = modInfos[fid_orig_plugin]
-            proper_index = orig_minf.real_index()
-            if orig_minf.is_esl():
-                return f'FE{proper_index - sort_offset:03X}' \
-                       f'{whole_lo_fid & 0x00000FFF:03X}'
+            try:
+                orig_is_esl, fid_prefix = fid_prefixes[fid_orig_plugin]
+            except KeyError:
+                orig_minf = modInfos[fid_orig_plugin]
+                proper_index = orig_minf.real_index()
+                if orig_is_esl := orig_minf.is_esl():
+                    fid_prefix = f'FE{proper_index - sort_offset:03X}'
+                else:
+                    fid_prefix = f'{proper_index:02X}'
+                fid_prefixes[fid_orig_plugin] = orig_is_esl, fid_prefix
+            if orig_is_esl:
+                return f'{fid_prefix}{whole_lo_fid & 0x00000FFF:03X}'
             else:
-                return f'{proper_index:02X}{whole_lo_fid & 0x00FFFFFF:06X}'
+                return f'{fid_prefix}{whole_lo_fid & 0x00FFFFFF:06X}'
     else:
         def format_fid(whole_lo_fid: int, _fid_orig_plugin):
             # For non-ESL games simple hexadecimal formatting will do
@@ -561,20 +594,21 @@ def log_collision(coll_fid, coll_inj, coll_plugin, coll_versions):
         # FormIDs must be in long format at this point
         proper_fid = format_fid(coll_fid, coll_plugin)
         if coll_inj:
-            log(u'* ' + _(u'%s injected into %s, colliding versions:')
-                % (proper_fid, coll_plugin))
+            coll_lines = [u'* ' + _(u'%s injected into %s, colliding '
+                                    u'versions:') % (proper_fid, coll_plugin)]
         else:
-            log(u'* ' + _(u'%s from %s, colliding versions:')
-                % (proper_fid, coll_plugin))
+            coll_lines = [u'* ' + _(u'%s from %s, colliding versions:')
+                          % (proper_fid, coll_plugin)]
         for ver_eid, ver_sig, ver_orig_plugin in coll_versions:
             fmt_record = format_record(ver_sig, proper_fid, ver_eid)
             # Mark the base record if the record wasn't injected
             if not coll_inj and ver_orig_plugin == coll_plugin:
-                log(u'  * ' + _(u'%s from %s (base record)') % (
+                coll_lines.append(u'  * ' + _(u'%s from %s (base record)') % (
                     fmt_record, ver_orig_plugin))
             else:
-                log(u'  * ' + _(u'%s from %s') % (
+                coll_lines.append(u'  * ' + _(u'%s from %s') % (
                     fmt_record, ver_orig_plugin))
+        log_lines(coll_lines)
     # -------------------------------------------------------------------------
     # From here on we have data on all plugin problems, so it's purely a matter
     # of building the log
@@ -748,8 +782,8 @@ def log_collision(coll_fid, coll_inj, coll_plugin, coll_versions):
         log_rel_fid_note()
         for p, ud_data in dict_sort(unnecessary_dels):
             log(f'* __{p}__')
-            for ud_fid, ud_sig in ud_data:
-                log(f'  * {format_record(ud_sig, str(ud_fid))}')
+            log_lines([f'  * {format_record(ud_sig, str(ud_fid))}'
+                       for ud_fid, ud_sig in ud_data])
     if old_weaps:
         log.setHeader(u'=== ' + _(u'Old Weapon Records'))
         log(_('The following plugins have old weapon (WEAP) records. These '
@@ -780,8 +814,8 @@ def log_collision(coll_fid, coll_inj, coll_plugin, coll_versions):
         log_rel_fid_note()
         for p, null_data in dict_sort(null_fids):
             log(f'* __{p}__')
-            for nd_sig, nd_eid in null_data:
-                log(f'  * {format_record(nd_sig, "00000000", nd_eid)}')
+            log_lines([f'  * {format_record(nd_sig, "00000000", nd_eid)}'
+                       for nd_sig, nd_eid in null_data])
     if hitmes:
         log.setHeader('=== ' + 'HITMEs')
         log(_('The following plugins have HITMEs (%(hitme_acronym)s), which '
@@ -807,14 +841,14 @@ def log_collision(coll_fid, coll_inj, coll_plugin, coll_versions):
               'author. Failing that, the safest course of action is to '
               'uninstall the plugins.'))
         log_whole_lo_fid_note()
-        for orig_fid, duplicates_counter in duplicate_formids.items():
-            for orig_plugin, dupe_count in duplicates_counter.items():
-                log('* ' + _('%(full_fid)s in %(orig_plugin)s: '
-                             'occurs %(num_duplicates)d times') % {
-                    'full_fid': format_fid(orig_fid, orig_plugin),
-                    'orig_plugin': orig_plugin,
-                    'num_duplicates': dupe_count,
-                })
+        dupe_msg = '* ' + _('%(full_fid)s in %(orig_plugin)s: occurs '
+                            '%(num_duplicates)d times')
+        log_lines([dupe_msg % {
+            'full_fid': format_fid(orig_fid, orig_plugin),
+            'orig_plugin': orig_plugin,
+            'num_duplicates': dupe_count,
+        } for orig_fid, duplicates_counter in duplicate_formids.items()
+            for orig_plugin, dupe_count in duplicates_counter.items()])
     if record_type_collisions:
         log.setHeader(u'=== ' + _(u'Record Type Collisions'))
         log(_('The following records override each other, but have different '
@@ -863,20 +897,27 @@ def log_collision(coll_fid, coll_inj, coll_plugin, coll_versions):
     return log_header + u'\n\n' + log.out.getvalue()
 
 #------------------------------------------------------------------------------
+# The fog fixer copies data it doesn't need to look at in chunks of this size
+_FOG_COPY_CHUNK = 1024 * 1024
+# Group types that can contain CELL records inside the CELL top group
+_FOG_CELL_BLOCK_TYPES = frozenset((2, 3))
+
 class NvidiaFogFixer(object):
     """Fixes cells to avoid nvidia fog problem."""
     def __init__(self,modInfo):
         self.modInfo = modInfo
         self.fixedCells = set()
 
-    def fix_fog(self, progress, __unpacker=structs_cache[u'=12s2f2l2f'].unpack,
-                __packer=structs_cache[u'12s2f2l2f'].pack):
+    def fix_fog(self, progress,
+                __unpack_fog=structs_cache['=12x2f12xf'].unpack_from,
+                __pack_fog_near=structs_cache['=f'].pack_into):
         """Duplicates file, then walks through and edits file as necessary."""
         progress.setFull(self.modInfo.fsize)
         fixedCells = self.fixedCells
         fixedCells.clear()
         #--File stream
         minfo_path = self.modInfo.getPath()
+        copy_buf = memoryview(bytearray(_FOG_COPY_CHUNK))
         #--Scan/Edit
         with TempFile() as out_path:
             with ModReader.from_info(self.modInfo) as ins:
@@ -887,28 +928,49 @@ def fix_fog(self, progress, __unpacker=structs_cache[u'=12s2f2l2f'].unpack,
                         _rsig = header.recType
                         # Copy the GRUP/record header
                         out.write(header.pack_head())
-                        # Treat CELL block subgroups record by record - analyze
-                        # CELLs but just copy cell-children records over. If
-                        # _rsig == GRUP no need to do anything (copied above)
-                        if ((header.is_top_group_header and
-                             header.label != b'CELL') or
-                                _rsig != b'GRUP' and _rsig != b'CELL'):
-                            buff = ins.read(header.blob_size)
-                            out.write(buff)
+                        # Only descend into the CELL top group and its
+                        # (sub-)blocks, analyzing CELLs as we go - any other
+                        # group or record can't contain CELLs, so just copy
+                        # it over without looking at what's inside
+                        if _rsig == b'GRUP':
+                            if header.is_top_group_header:
+                                copy_blob = header.label != b'CELL'
+                            else:
+                                copy_blob = (header.groupType not in
+                                             _FOG_CELL_BLOCK_TYPES)
+                        else:
+                            copy_blob = _rsig != b'CELL'
+                        if copy_blob:
+                            # Whole groups can be dozens of MB, so copy them
+                            # over in chunks, reusing the same buffer
+                            blob_left = header.blob_size
+                            while blob_left > 0:
+                                copy_view = copy_buf[:min(blob_left,
+                                                          _FOG_COPY_CHUNK)]
+                                ins.readinto(copy_view)
+                                out.write(copy_view)
+                                blob_left -= len(copy_view)
                         #--Handle cells
                         elif _rsig == b'CELL':
+                            # Collect the CELL's subrecords and write them out
+                            # all at once
+                            cell_out = io.BytesIO()
                             next_header = ins.tell() + header.blob_size
                             while ins.tell() < next_header:
                                 subrec = SubrecordBlob(ins, _rsig)
                                 if subrec.mel_sig == b'XCLL':
-                                    color, near, far, rotXY, rotZ, fade, \
-                                        clip = __unpacker(subrec.mel_data)
+                                    # Only unpack the fog near/far and clip
+                                    # distance, then patch the fog near value
+                                    # in place - the rest stays untouched
+                                    near, far, clip = __unpack_fog(
+                                        subrec.mel_data)
                                     if not (near or far or clip):
-                                        near = 0.0001
-                                        subrec.mel_data = __packer(color, near,
-                                            far, rotXY, rotZ, fade, clip)
+                                        xcll_data = bytearray(subrec.mel_data)
+                                        __pack_fog_near(xcll_data, 12, 0.0001)
+                                        subrec.mel_data = bytes(xcll_data)
                                         fixedCells.add(header.fid)
-                                subrec.packSub(out, subrec.mel_data)
+                                subrec.packSub(cell_out, subrec.mel_data)
+                            out.write(cell_out.getbuffer())
             if fixedCells:
                 self.modInfo.makeBackup()
                 minfo_path.replace_with_temp(out_path)
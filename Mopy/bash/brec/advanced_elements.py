@@ -31,12 +31,15 @@
 import copy
 from collections.abc import Callable
 from itertools import chain
+from struct import Struct
 from typing import Any, BinaryIO
 
-from .basic_elements import MelBase, MelNull, MelNum, MelObject, \
-    MelSequential, MelStruct
+from . import utils_constants
+from .basic_elements import MelBase, MelFid, MelFloat, MelNull, MelNum, \
+    MelObject, MelSequential, MelStruct
+from .utils_constants import FID
 from .. import bush
-from ..bolt import attrgetter_cache, deprint, structs_cache
+from ..bolt import Rounder, attrgetter_cache, deprint, structs_cache
 from ..exception import ArgumentError, ModSizeError
 
 #------------------------------------------------------------------------------
@@ -332,6 +335,10 @@ def __init__(self, array_attr: str, element: MelBase,
         # Underscore means internal usage only - e.g. distributor state
         self.array_element_attrs = [s for s in element.getSlotsUsed() if
                                     not s.startswith(u'_')]
+        # Plain MelStructs can have all entries unpacked at once - anything
+        # with its own loading logic (e.g. truncated structs) loads each entry
+        self._bulk_unpacker = (element.iter_unpack
+            if type(element).load_mel is MelStruct.load_mel else None)
         # Validate that the prelude is valid if it's present (i.e. it must have
         # only one signature and it must match the element's signature)
         if prelude:
@@ -393,6 +400,25 @@ def _load_array(self, record, ins, sub_type, size_, debug_strs):
         append_entry = getattr(record, self.attr).append
         entry_slots = self.array_element_attrs
         entry_size = self._element_size
+        if self._bulk_unpacker:
+            # Inlined from MelStruct.load_mel
+            struct_attrs = self._element.attrs
+            struct_actions = (self._element.actions
+                              if self._element._action_dexes else None)
+            for unpacked in self._bulk_unpacker(ins.read(
+                    size_ // entry_size * entry_size, *debug_strs)):
+                arr_entry = MelObject()
+                append_entry(arr_entry)
+                arr_entry.__slots__ = entry_slots
+                if struct_actions is None:
+                    for att, val in zip(struct_attrs, unpacked):
+                        setattr(arr_entry, att, val)
+                else:
+                    for att, val, action in zip(struct_attrs, unpacked,
+                                                struct_actions):
+                        setattr(arr_entry, att,
+                                action(val) if action is not None else val)
+            return
         load_entry = self._element.load_mel
         for x in range(size_ // entry_size):
             arr_entry = MelObject()
@@ -421,6 +447,12 @@ def _pack_array_data(self, array_val):
              array_val])
 
 #------------------------------------------------------------------------------
+# Maps the load_bytes implementations of the MelNum types that
+# MelSimpleArray can unpack in bulk to the action that has to be applied to
+# each unpacked value
+_simple_array_actions = {MelNum.load_bytes: None,
+                         MelFloat.load_bytes: Rounder, MelFid.load_bytes: FID}
+
 class MelSimpleArray(MelArray):
     """A MelArray of simple elements (currently MelNum) - override loading and
     dumping of the array to avoid creating mel objects."""
@@ -431,13 +463,37 @@ def __init__(self, array_attr, element: MelNum, prelude=None):
             raise SyntaxError(f'MelSimpleArray only accepts MelNum, passed: '
                               f'{element!r}')
         super().__init__(array_attr, element, prelude)
+        # Plain numbers, floats and FormIDs can be unpacked all at once - the
+        # loading of anything else (e.g. flags, or subclasses with their own
+        # load_bytes or unpacker) is left to the element
+        el_load_bytes = type(element).load_bytes
+        el_struct = getattr(element._unpacker, '__self__', None)
+        if (el_load_bytes in _simple_array_actions and
+                isinstance(el_struct, Struct) and
+                element._unpacker == el_struct.unpack):
+            self._simple_iter_unpack = el_struct.iter_unpack
+            self._simple_action = _simple_array_actions[el_load_bytes]
+        else:
+            self._simple_iter_unpack = self._simple_action = None
 
     def _load_array(self, record, ins, sub_type, size_, *debug_strs):
         entry_size = self._element_size
-        load_element = self._element.load_bytes
-        getattr(record, self.attr).extend([
-            load_element(ins, entry_size, *debug_strs) for _x in
-            range(size_ // entry_size)])
+        num_entries = size_ // entry_size
+        if self._simple_iter_unpack is None:
+            load_element = self._element.load_bytes
+            loaded_entries = [load_element(ins, entry_size, *debug_strs) for
+                              _x in range(num_entries)]
+        else:
+            raw_entries = self._simple_iter_unpack(ins.read(
+                num_entries * entry_size, *debug_strs))
+            if (bulk_action := self._simple_action) is None:
+                loaded_entries = [e for e, in raw_entries]
+            else:
+                if bulk_action is FID:
+                    # Skip FID's extra lambda call for each entry
+                    bulk_action = utils_constants.FORM_ID
+                loaded_entries = [bulk_action(e) for e, in raw_entries]
+        getattr(record, self.attr).extend(loaded_entries)
 
     def _map_array_fids(self, record, function, save_fids):
         if self._element_has_fids:
@@ -493,10 +549,16 @@ def _pre_process_unpacked(self, unpacked_val):
         any way before it is used to assign attributes, however make sure to
         call the parent method which applies actions to the unpacked values.
         Don't apply the actions in overrides."""
-        return (*(val if act is None else act(val) for val, act in
-                  zip(unpacked_val, self.actions)),
+        num_unpacked = len(unpacked_val)
+        if self._action_dexes:
+            # Only visit the fields that have an action, most have none
+            unpacked_val = [*unpacked_val]
+            actions = self.actions
+            for dex in self._action_dexes:
+                if dex < num_unpacked:
+                    unpacked_val[dex] = actions[dex](unpacked_val[dex])
         # append default values (actions are already applied to self.defaults!)
-                *self.defaults[len(unpacked_val):])
+        return *unpacked_val, *self.defaults[num_unpacked:]
 
     @property
     def static_size(self):
@@ -974,8 +1036,13 @@ def getDefault(self):
     def getLoaders(self, loaders):
         temp_loaders = {}
         self._wrapped_mel.getLoaders(temp_loaders)
-        for l in temp_loaders:
-            loaders[l] = self
+        if type(self).load_mel is _MelWrapper.load_mel:
+            # We would just forward to the wrapped element's loaders (e.g.
+            # MelCounter, MelSorted), so let them load directly
+            loaders.update(temp_loaders)
+        else:
+            for l in temp_loaders:
+                loaders[l] = self
 
     def hasFids(self, formElements):
         self._wrapped_mel.hasFids(formElements)
@@ -1155,5 +1222,7 @@ def sort_subrecord(self, record):
         # depend on their order
         super().sort_subrecord(record)
         to_sort_val = getattr(record, self._wrapped_mel.attr)
-        if to_sort_val:
+        # Most of these lists hold zero or one entries, don't bother building
+        # keys for those
+        if len(to_sort_val) > 1:
             to_sort_val.sort(key=self._attr_key_func)
@@ -32,7 +32,7 @@
     int_unpacker, null1
 from .. import bolt, bush, exception
 from ..bolt import Rounder, attrgetter_cache, decoder, encode, sig_to_str, \
-    struct_calcsize, struct_error, structs_cache
+    struct_error, structs_cache
 
 #------------------------------------------------------------------------------
 class MelObject(object):
@@ -75,6 +75,8 @@ class Subrecord(object):
     sub_header_fmt = u'=4sH'
     # precompiled unpacker for sub-record headers
     sub_header_unpack = structs_cache[sub_header_fmt].unpack
+    # Same, but unpacking at an offset into a buffer
+    sub_header_unpack_from = structs_cache[sub_header_fmt].unpack_from
     # Size of sub-record headers. Morrowind has a different one.
     sub_header_size = 6
     __slots__ = (u'mel_sig',)
@@ -378,6 +380,10 @@ class MelGroup(MelSequential):
     def __init__(self, attr: str, *elements):
         super(MelGroup, self).__init__(*elements)
         self.attr, self.loaders = attr, {}
+        # The elements don't change after this, so collect the slots of our
+        # targets once instead of every time we create one
+        self._group_slots = [s for element in self.elements
+                             for s in element.getSlotsUsed()]
 
     def getDefaulters(self,defaulters,base):
         defaulters[base+self.attr] = self
@@ -396,8 +402,7 @@ def setDefault(self,record):
 
     def getDefault(self):
         target = MelObject()
-        target.__slots__ = [s for element in self.elements for s in
-                            element.getSlotsUsed()]
+        target.__slots__ = self._group_slots
         for element in self.elements:
             element.setDefault(target)
         return target
@@ -664,10 +669,12 @@ def __init__(self, mel_sig: bytes, struct_formats: list[str], *elements,
             raise SyntaxError(f'Expected a list got "{struct_formats}"')
         self._is_required = is_required
         # Sometimes subrecords have to preserve non-aligned sizes, check that
-        # we don't accidentally pad those to alignment
-        struct_format = u''.join(struct_formats)
-        if (struct_calcsize(struct_format) != struct_calcsize(
-                u'=' + struct_format)):
+        # we don't accidentally pad those to alignment. Go through
+        # structs_cache, since the same formats recur all over the record
+        # definitions of every game and struct's own cache is tiny
+        struct_format = ''.join(struct_formats)
+        if (structs_cache[struct_format].size !=
+                structs_cache[f'={struct_format}'].size):
             struct_format = f'={struct_format}'
         self.mel_sig = mel_sig
         self.attrs, self.defaults, self.actions, self.formAttrs = \
@@ -683,6 +690,13 @@ def __init__(self, mel_sig: bytes, struct_formats: list[str], *elements,
             present_attrs.add(a)
         self._unpacker, self._packer, self._static_size, = get_structs(
             struct_format)
+        self._iter_unpacker = structs_cache[struct_format].iter_unpack
+
+    def iter_unpack(self, struct_data: bytes):
+        """Unpack struct_data, whose size must be a multiple of this struct's
+        size, into a tuple of raw values per struct. Note that the actions are
+        not applied."""
+        return self._iter_unpacker(struct_data)
 
     def getSlotsUsed(self):
         return self.attrs
@@ -697,6 +711,12 @@ def setDefault(self, record, *, __nones=repeat(None)):
 
     def load_mel(self, record, ins, sub_type, size_, *debug_strs):
         unpacked = ins.unpack(self._unpacker, size_, *debug_strs)
+        if not self._action_dexes:
+            # Plenty of structs have no FormIDs, flags or floats at all, so
+            # skip checking each of their fields for an action
+            for att, val in zip(self.attrs, unpacked):
+                setattr(record, att, val)
+            return
         for att, val, action in zip(self.attrs, unpacked, self.actions):
             setattr(record, att, action(val) if action is not None else val)
 
@@ -22,6 +22,7 @@
 # =============================================================================
 """Builds on the basic elements defined in base_elements.py to provide
 definitions for some commonly needed subrecords."""
+import functools
 from itertools import chain
 
 from .advanced_elements import AttrValDecider, FidNotNullDecider, \
@@ -88,6 +89,30 @@ def __init__(self, lvl_element: MelBase, *, with_coed=True,
                 MelUInt8(b'LLCT', 'entry_count'), counts='entries'))
         super().__init__(*final_elements)
 
+#------------------------------------------------------------------------------
+class AMelModel(MelGroup):
+    """Base class for the model subrecords. Subclasses define typeSets and
+    _build_elements, which gets passed mel_sig plus any extra configuration
+    arguments given to __init__. Dozens of records have models, but only in a
+    handful of configurations - so the (stateless) elements are built once per
+    configuration and shared."""
+    # Maps the first signature of each model to all its signatures
+    typeSets: dict[bytes, tuple[bytes, ...]]
+
+    def __init__(self, mel_sig: bytes, attr: str, *model_config):
+        super().__init__(attr, *_model_elements(self.__class__, mel_sig,
+            *model_config))
+
+    @classmethod
+    def _build_elements(cls, mel_sig: bytes, *model_config) -> list[MelBase]:
+        """Return the elements of a model starting with mel_sig."""
+        raise NotImplementedError
+
+@functools.cache
+def _model_elements(model_class: type[AMelModel], mel_sig: bytes,
+        *model_config) -> tuple[MelBase, ...]:
+    return tuple(model_class._build_elements(mel_sig, *model_config))
+
 #------------------------------------------------------------------------------
 class MelActiFlags(MelUInt16Flags):
     """Handles the ACTI subrecord FNAM (Flags). Note that this subrecord is
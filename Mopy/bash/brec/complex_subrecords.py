@@ -627,8 +627,7 @@ def efix_param_info(self, new_efix_info):
             target = _MelHackyObject()
             for element in self.elements:
                 element.setDefault(target)
-            target.__slots__ = [s for element in self.elements for s in
-                                element.getSlotsUsed()]
+            target.__slots__ = self._group_slots
             setattr(record, self.attr, target)
         self.loaders[sub_type].load_mel(target, ins, sub_type, size_,
             *debug_strs)
@@ -332,6 +332,21 @@ def read(self, size, *debug_strs, file_offset=None):
             raise ModSizeError(self.inName, debug_strs, (target_size,), size)
         return self.ins.read(size)
 
+    def readinto(self, buffer, *debug_strs):
+        """Read from file into the specified writable buffer, filling it
+        completely. Avoids creating a new bytes object for every read."""
+        size = len(buffer)
+        endPos = self.ins.tell() + size
+        if endPos > self.size:
+            target_size = size - (endPos - self.size)
+            raise ModSizeError(self.inName, debug_strs, (target_size,), size)
+        # The file may have been truncated since we got its size - don't leave
+        # stale bytes from a previous read in (possibly reused) buffers
+        if (read_size := self.ins.readinto(buffer)) != size:
+            raise ModReadError(self.inName, debug_strs, endPos,
+                               endPos - size + read_size)
+        return read_size
+
     def readLString(self, size, *debug_strs, __unpacker=int_unpacker):
         """Read translatable string. If the mod has STRINGS files, this is a
         uint32 to lookup the string in the string table. Otherwise, this is a
@@ -353,8 +368,12 @@ def readString32(self, *debug_str, __unpacker=int_unpacker):
 
     def readString(self, size, *debug_strs):
         """Read string from file, stripping zero terminator."""
+        str_data = bolt.cstrip(self.read(size, *debug_strs))
+        if b'\n' not in str_data: # by far the most common case
+            return decoder(str_data, bolt.pluginEncoding,
+                           avoidEncodings=('utf8', 'utf-8'))
         return u'\n'.join(decoder(x,bolt.pluginEncoding,avoidEncodings=(u'utf8',u'utf-8')) for x in
-                          bolt.cstrip(self.read(size, *debug_strs)).split(b'\n'))
+                          str_data.split(b'\n'))
 
     def readStrings(self, size, *debug_strs):
         """Read strings from file, stripping zero terminator."""
@@ -395,6 +414,10 @@ def __enter__(self, __head_unpack=unpack_header):
             raise
         return self
 
+# Plugins and saves are written out one (sub)record at a time, so use a much
+# bigger buffer than the default to cut down on the number of write calls
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
 class FormIdWriteContext:
     """Now we must translate the fids based on the masters of the mod we
     write."""
@@ -434,7 +457,8 @@ def __enter__(self, __head_unpack=unpack_header):
         utils_constants.short_mapper = self._get_short_mapper()
         utils_constants.short_mapper_no_engine = self._get_short_mapper(
             skip_engine=True)
-        self.__out = self._out_path and open(self._out_path, 'wb')
+        self.__out = self._out_path and open(self._out_path, 'wb',
+                                             buffering=_WRITE_BUFFER_SIZE)
         return self.__out
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
@@ -274,6 +274,12 @@ def __new__(cls, name, bases, classdict):
         classdict['__slots__'] = (*slots, *melSet.getSlotsUsed()) if (
             melSet := classdict.get('melSet', ())) else slots
         new = super(RecordType, cls).__new__(cls, name, bases, classdict)
+        # A single base without __slots__ (e.g. a plain mixin) would give
+        # every record instance a __dict__ again
+        for base in new.__mro__[1:-1]:
+            if '__slots__' not in base.__dict__:
+                raise SyntaxError(f'{name}: base class {base.__qualname__} '
+                                  f'does not define __slots__')
         if rsig := getattr(new, 'rec_sig', None):
             cls.sig_to_class[rsig] = new
             if new.melSet:
@@ -385,7 +391,10 @@ def getDecompressed(self, *, __unpacker=int_unpacker):
         if not self.flags1.compressed:
             return io.BytesIO(self.data), len(self.data)
         decompressed_size, = __unpacker(self.data[:4])
-        decomp = zlib.decompress(self.data[4:])
+        comp_data = self.data[4:]
+        # Preallocate the output, capped at deflate's maximum ratio
+        decomp = zlib.decompress(comp_data, zlib.MAX_WBITS,
+            min(decompressed_size, len(comp_data) * 1032))
         if len(decomp) != decompressed_size:
             raise exception.ModError(self.inName,
                 f'Mis-sized compressed data. Expected {decompressed_size}, '
@@ -22,11 +22,13 @@
 # =============================================================================
 """Encapsulates Linux-specific classes and methods."""
 
+import array
 import functools
 import os
+import shutil
 import subprocess
 import sys
-from collections import deque
+from pathlib import PurePath
 
 from .common import _find_legendary_games, _LegacyWinAppInfo, \
     _parse_steam_manifests
@@ -76,9 +78,12 @@ def _get_steamuser_path(submod, user_relative_path: str) -> str | None:
                 return candidate_path
             # No good, it was created with some users' actual username. Filter
             # out 'Public', which is always present and does not contain the
-            # files we're looking for
-            all_user_filenames = [u for u in os.listdir(users_path)
-                                  if u.lower() != 'public']
+            # files we're looking for, as well as any stray files - scandir
+            # gives us the file type without an extra stat call
+            with os.scandir(users_path) as users_it:
+                all_user_filenames = [u.name for u in users_it if
+                                      u.name.lower() != 'public' and
+                                      u.is_dir()]
             if len(all_user_filenames) == 1:
                 candidate_path = os.path.join(users_path,
                     all_user_filenames[0], user_relative_path)
@@ -96,6 +101,27 @@ def _get_steamuser_path(submod, user_relative_path: str) -> str | None:
                     return candidate_path
     return None
 
+# Maps XDG environment variables to the legacy paths (relative to the user's
+# home folder) that they fall back to. For this mapping, see:
+#  - https://specifications.freedesktop.org/basedir-spec/basedir-spec-latest.html
+#  - https://wiki.archlinux.org/title/XDG_user_directories
+_XDG_FALLBACKS = {
+    'XDG_CACHE_HOME':      '.cache',
+    'XDG_CONFIG_HOME':     '.config',
+    'XDG_DATA_HOME':       '.local/share',
+    'XDG_DESKTOP_DIR':     'Desktop',
+    'XDG_DOCUMENTS_DIR':   'Documents',
+    'XDG_DOWNLOAD_DIR':    'Downloads',
+    'XDG_MUSIC_DIR':       'Music',
+    'XDG_PICTURES_DIR':    'Pictures',
+    'XDG_PUBLICSHARE_DIR': 'Public',
+    'XDG_STATE_HOME':      '.local/state',
+    'XDG_TEMPLATES_DIR':   'Templates',
+    'XDG_VIDEOS_DIR':      'Videos',
+}
+
+# The environment isn't going to change while we're running
+@functools.cache
 def _get_xdg_path(xdg_var: str) -> _Path | None:
     """Retrieve a path from an XDG environment variable. If no such variable is
     set, fall back to the corresponding legacy path. If that *also* doesn't
@@ -103,24 +129,9 @@ def _get_xdg_path(xdg_var: str) -> _Path | None:
     will have to use CLI or bash.ini to set the path."""
     if xdg_val := os.environ.get(xdg_var):
         return _GPath(xdg_val)
-    home_path = os.path.expanduser('~')
-    # For this mapping, see:
-    #  - https://specifications.freedesktop.org/basedir-spec/basedir-spec-latest.html
-    #  - https://wiki.archlinux.org/title/XDG_user_directories
-    return _GPath_no_norm({
-        'XDG_CACHE_HOME':      f'{home_path}/.cache',
-        'XDG_CONFIG_HOME':     f'{home_path}/.config',
-        'XDG_DATA_HOME':       f'{home_path}/.local/share',
-        'XDG_DESKTOP_DIR':     f'{home_path}/Desktop',
-        'XDG_DOCUMENTS_DIR':   f'{home_path}/Documents',
-        'XDG_DOWNLOAD_DIR':    f'{home_path}/Downloads',
-        'XDG_MUSIC_DIR':       f'{home_path}/Music',
-        'XDG_PICTURES_DIR':    f'{home_path}/Pictures',
-        'XDG_PUBLICSHARE_DIR': f'{home_path}/Public',
-        'XDG_STATE_HOME':      f'{home_path}/.local/state',
-        'XDG_TEMPLATES_DIR':   f'{home_path}/Templates',
-        'XDG_VIDEOS_DIR':      f'{home_path}/Videos',
-    }.get(xdg_var))
+    if (xdg_fallback := _XDG_FALLBACKS.get(xdg_var)) is None:
+        return None
+    return _GPath_no_norm(f"{os.path.expanduser('~')}/{xdg_fallback}")
 
 @functools.cache
 def _get_steam_path() -> _Path | None:
@@ -223,42 +234,59 @@ def getJava():
         if java_bin_path.is_file(): return java_bin_path
     except KeyError: # no JAVA_HOME
         pass
-    try:
-        java_bin_path = subprocess.check_output(
-            u'command -v java', shell=True,
-            encoding=_Path.sys_fs_enc).rstrip(u'\n')
-    except subprocess.CalledProcessError:
-        # Fall back to the likely correct path on most distros - but probably
-        # Java is missing entirely if command can't find it
-        java_bin_path = u'/usr/bin/java'
+    # Fall back to the likely correct path on most distros - but probably
+    # Java is missing entirely if it can't be found on the PATH
+    java_bin_path = shutil.which('java') or '/usr/bin/java'
     return _GPath(java_bin_path)
 
 # TODO(inf) This method needs support for string fields and product versions
 def get_file_version(filename):
     """A python replacement for win32api.GetFileVersionInfo that can be used
     on systems where win32api isn't available."""
+    # Parsing the PE headers takes dozens of reads, while LOOT conditions and
+    # the app buttons keep asking about the same few files - so cache the
+    # result for as long as the file stays the same
+    file_stat = os.stat(filename)
+    return _get_file_version(filename, file_stat.st_mtime_ns,
+                             file_stat.st_size)
+
+@functools.lru_cache(maxsize=512)
+def _get_file_version(filename, _mtime_ns: int, _size: int):
+    """Parse the version out of the specified PE file. The mtime and size are
+    only passed in so that they become part of the cache key."""
     _WORD, _DWORD = u'<H', u'<I'
     def _read(target_fmt, file_obj, offset=0, count=1, absolute=False):
         """Read one or more chunks from the file, either a word or dword."""
         target_struct = structs_cache[target_fmt]
         file_obj.seek(offset, not absolute)
-        result = [target_struct.unpack(file_obj.read(target_struct.size))[0]
-                  for _x in range(count)] ##: array.fromfile(f, n)
-        return result[0] if count == 1 else result
+        if count == 1:
+            return target_struct.unpack(file_obj.read(target_struct.size))[0]
+        # Read all chunks at once and unpack them in one go
+        return [r[0] for r in target_struct.iter_unpack(
+            file_obj.read(target_struct.size * count))]
     def _find_version(file_obj, pos, offset):
         """Look through the RT_VERSION and return VS_VERSION_INFO."""
         def _pad(num):
-            return num if num % 4 == 0 else num + 4 - (num % 4)
+            """Round num up to the next multiple of 4 (DWORD alignment)."""
+            return (num + 3) & ~3
         file_obj.seek(pos + offset)
         len_, val_len, type_ = _read(_WORD, file_obj, count=3)
-        info = u''
-        for i in range(200):
-            info += chr(_read(_WORD, file_obj))
-            if info[-1] == u'\x00': break
-        offset = _pad(file_obj.tell()) - pos
+        # The key is a null-terminated UTF-16 string of at most 200 chars -
+        # read all of it at once and look for the terminator word by word
+        key_pos = file_obj.tell()
+        raw_key = file_obj.read(400)
+        try:
+            key_end = array.array('H', raw_key[:len(raw_key) & ~1]).index(
+                0) * 2
+        except ValueError: # Unterminated, use whatever we got
+            key_end = key_size = len(raw_key)
+        else: # Skip past the terminator too
+            key_size = key_end + 2
+        info = raw_key[:key_end].decode('utf-16-le', 'surrogatepass')
+        offset = _pad(key_pos + key_size) - pos
         file_obj.seek(pos + offset)
         if type_ == 0: # binary data
-            if info[:-1] == u'VS_VERSION_INFO':
+            if info == 'VS_VERSION_INFO':
                 file_v = _read(_WORD, file_obj, count=4, offset=8)
                 # prod_v = _read(_WORD, f, count=4) # this isn't used
                 return 0, (file_v[1], file_v[0], file_v[3], file_v[2])
@@ -288,8 +316,9 @@ def _pad(num):
             f.seek(section_pos)
             if f.read(8).rstrip(b'\x00') != b'.rsrc':  # section name_
                 continue
-            section_va = _read(_DWORD, f, offset=4)
-            raw_data_pos = _read(_DWORD, f, offset=4)
+            # Read VirtualAddress through PointerToRawData in one go
+            section_va, _raw_size, raw_data_pos = _read(_DWORD, f, offset=4,
+                                                        count=3)
             section_resources_pos = raw_data_pos + resources_va - section_va
             num_named, num_id = _read(_WORD, f, count=2, absolute=True,
                                       offset=section_resources_pos + 12)
@@ -322,9 +351,9 @@ def python_tools_dir():
     for path_entry in sys.path:
         tools_path = os.path.join(path_entry, u'Tools')
         # Actually check for the files we really want
-        try_paths = [os.path.join(tools_path, u'i18n', x)
-                     for x in (u'msgfmt.py', u'pygettext.py')]
-        if all(os.path.isfile(p) for p in try_paths):
+        i18n_path = os.path.join(tools_path, 'i18n')
+        if (os.path.isfile(os.path.join(i18n_path, 'msgfmt.py')) and
+                os.path.isfile(os.path.join(i18n_path, 'pygettext.py'))):
             return tools_path
     # Fall back on /usr/lib/python*.* - this should never happen
     _deprint(u'Failed to find Python Tools dir on sys.path')
@@ -334,21 +363,54 @@ def python_tools_dir():
 def convert_separators(p):
     return p.replace(u'\\', u'/')
 
-##: A more performant implementation would maybe cache folder contents or
-# something similar, as it stands this is not usable for fixing BAIN on Linux
+# Maps directory paths to their mtime and case-insensitive listing, see
+# _ci_dir_entries. Kept small, since listings of big folders are not cheap
+_ci_listings: dict[str, tuple[int, dict[str, str]]] = {}
+_CI_LISTINGS_MAX = 64
+
+def _ci_dir_entries(dir_path: str, *,
+        force_rescan=False) -> tuple[dict[str, str], bool]:
+    """Return a dict mapping the lowercased names of all entries in the
+    specified directory to their actual names, plus a bool that is True if
+    the directory was just (re)scanned. Listings are cached per directory and
+    rescanned when the directory's mtime changes. Coarse timestamps can hide
+    changes though, so callers pass force_rescan=True when a cached listing
+    turns out to be stale, which replaces the cached listing."""
+    dir_mtime_ns = os.stat(dir_path).st_mtime_ns
+    if not force_rescan:
+        cached_mtime, ci_entries = _ci_listings.get(dir_path, (None, None))
+        if cached_mtime == dir_mtime_ns:
+            return ci_entries, False
+    ci_entries = {}
+    with os.scandir(dir_path) as dir_it:
+        for dir_entry in dir_it:
+            # Keep the first match, like the plain listdir loop would
+            ci_entries.setdefault(dir_entry.name.lower(), dir_entry.name)
+    _ci_listings.pop(dir_path, None)
+    if len(_ci_listings) >= _CI_LISTINGS_MAX:
+        # Evict the least recently scanned listing
+        del _ci_listings[next(iter(_ci_listings))]
+    _ci_listings[dir_path] = (dir_mtime_ns, ci_entries)
+    return ci_entries, True
+
+##: Still not fast enough for fixing BAIN on Linux, but at least we no longer
+# list the same folders over and over again
 def canonize_ci_path(ci_path: os.PathLike | str) -> _Path | None:
     if os.path.exists(ci_path):
         # Fast path, but GPath it as we haven't normpathed it yet
         return _GPath(ci_path)
     # Find the longest prefix that exists in the filesystem - *some* prefix
-    # must exist, even if it's only root
-    path_prefix, ci_rem_part = os.path.split(os.path.normpath(ci_path))
-    ci_remaining_parts = deque([ci_rem_part])
-    while not os.path.exists(path_prefix):
-        path_prefix, ci_rem_part = os.path.split(path_prefix)
-        ci_remaining_parts.appendleft(ci_rem_part)
-    constructed_path = path_prefix
-    for ci_part in ci_remaining_parts:
+    # must exist, even if it's only root. Usually only the last part or two
+    # have the wrong case, so walk up from the end
+    ci_parts = PurePath(os.path.normpath(ci_path)).parts
+    prefix_len = len(ci_parts) - 1 # the whole path does not exist, see above
+    while prefix_len and not os.path.exists(
+            os.path.join(*ci_parts[:prefix_len])):
+        prefix_len -= 1
+    # For relative paths, nothing may exist but the working directory
+    constructed_path = os.path.join(*ci_parts[:prefix_len]) if prefix_len \
+        else ''
+    for ci_part in ci_parts[prefix_len:]:
         new_ci_path = os.path.join(constructed_path, ci_part)
         if os.path.exists(new_ci_path):
             # If this part exists with the correct case, keep going
@@ -356,18 +418,25 @@ def canonize_ci_path(ci_path: os.PathLike | str) -> _Path | None:
         else:
             # Otherwise we have to list the entire folder and
             # case-insensitively look for a match
-            ci_part_lower = ci_part.lower()
-            for candidate_file in os.listdir(constructed_path):
-                if candidate_file.lower() == ci_part_lower:
-                    # We found a matching file, construct the new path with the
-                    # right case and resume the outer loop
-                    constructed_path = os.path.join(constructed_path,
-                        candidate_file)
-                    break
-            else:
+            listed_dir = constructed_path or os.curdir
+            ci_lower = ci_part.lower()
+            ci_entries, was_scanned = _ci_dir_entries(listed_dir)
+            candidate_file = ci_entries.get(ci_lower)
+            if not was_scanned and (candidate_file is None or
+                    not os.path.exists(os.path.join(constructed_path,
+                                                    candidate_file))):
+                # The cached listing may be stale - filesystems with coarse
+                # timestamps (FAT, exFAT, SMB, ...) or several changes in the
+                # same tick leave the mtime unchanged. Rescan and replace it
+                candidate_file = _ci_dir_entries(
+                    listed_dir, force_rescan=True)[0].get(ci_lower)
+            if candidate_file is None:
                 # We can't find this part at all, so the whole path can't be
                 # found -> None
                 return None
+            # We found a matching file, construct the new path with the right
+            # case and resume the outer loop
+            constructed_path = os.path.join(constructed_path, candidate_file)
     return _GPath_no_norm(constructed_path)
 
 def set_file_hidden(file_to_hide: str | os.PathLike, is_hidden=True):
@@ -26,7 +26,8 @@
 
 from ... import bush
 from ...bolt import Flags, TrimmedFlags, flag, struct_calcsize, structs_cache
-from ...brec import FID, AMelItems, AMelLLItems, AMreActor, AMreCell, \
+from ...brec import FID, AMelItems, AMelLLItems, AMelModel, \
+    AMreActor, AMreCell, \
     AMreFlst, AMreHeader, AMreImad, AMreLeveledList, AMreRace, AMreWithItems, \
     AMreWrld, AMreWthr, AttrValDecider, BipedFlags, MelActionFlags, \
     MelActivateParents, MelActorSounds, MelAddnDnam, MelAnimations, MelArray, \
@@ -133,7 +134,7 @@ class HeaderFlags(MelRecord.HeaderFlags):
         multi_bound: bool = flag(31)
 
 #------------------------------------------------------------------------------
-class MelModel(MelGroup):
+class MelModel(AMelModel):
     """Represents a model subrecord."""
     typeSets = {
         b'MODL': (b'MODL', b'MODB', b'MODT', b'MODS', b'MODD'),
@@ -150,7 +151,11 @@ class _FacegenModelFlags(Flags):
         leftHand: bool
 
     def __init__(self, mel_sig=b'MODL', attr='model', with_facegen_flags=True):
-        types = self.__class__.typeSets[mel_sig]
+        super().__init__(mel_sig, attr, with_facegen_flags)
+
+    @classmethod
+    def _build_elements(cls, mel_sig, with_facegen_flags):
+        types = cls.typeSets[mel_sig]
         mdl_elements = [MelString(types[0], 'modPath')]
         if mel_sig != b'DMDL':
             mdl_elements.extend([
@@ -163,8 +168,8 @@ def __init__(self, mel_sig=b'MODL', attr='model', with_facegen_flags=True):
         # No MODD/MOSD equivalent for MOD2 and MOD4
         if len(types) == 5 and with_facegen_flags:
             mdl_elements.append(MelUInt8Flags(types[4], 'facegen_model_flags',
-                self.__class__._FacegenModelFlags))
-        super().__init__(attr, *mdl_elements)
+                cls._FacegenModelFlags))
+        return mdl_elements
 
 #------------------------------------------------------------------------------
 class MelActivationPrompt(MelString):
@@ -24,7 +24,8 @@
 import operator
 
 from ...bolt import Flags, flag
-from ...brec import FID, AMelItems, AMelLLItems, AMelNvnm, AMelVmad, \
+from ...brec import FID, AMelItems, AMelLLItems, AMelModel, \
+    AMelNvnm, AMelVmad, \
     AMreCell, AMreFlst, AMreHeader, AMreImad, AMreLeveledList, AMreWithItems, \
     AMreWithKeywords, ANvnmContext, AttrValDecider, AVmadContext, BipedFlags, \
     FormVersionDecider, MelActiFlags, MelAddnDnam, MelAlchEnit, MelExtra, \
@@ -80,7 +81,7 @@
 #------------------------------------------------------------------------------
 # Record Elements -------------------------------------------------------------
 #------------------------------------------------------------------------------
-class MelModel(MelGroup):
+class MelModel(AMelModel):
     """Represents a model subrecord."""
     # MODB and MODD are no longer used by TES5Edit
     typeSets = {
@@ -105,11 +106,15 @@ def __init__(self, mel_sig=b'MODL', attr='model', *, swap_3_4=False,
         :param always_use_modc: If True, use MODC for the third (*C) element,
             regardless of what mel_sig is.
         :param no_flags: If True, skip the flags (*F) element."""
-        types = self.__class__.typeSets[mel_sig]
+        super().__init__(mel_sig, attr, swap_3_4, always_use_modc, no_flags)
+
+    @classmethod
+    def _build_elements(cls, mel_sig, swap_3_4, always_use_modc, no_flags):
+        types = cls.typeSets[mel_sig]
         mdl_elements = [
             MelString(types[0], 'modPath'),
-            # Ignore texture hashes - they're only an optimization, plenty
-            # of records in Skyrim.esm are missing them
+            # Ignore texture hashes - they're only an optimization, plenty of
+            # records in Skyrim.esm are missing them
             MelNull(types[1]),
             MelFloat(b'MODC' if always_use_modc else types[2],
                 'color_remapping_index'),
@@ -119,8 +124,8 @@ def __init__(self, mel_sig=b'MODL', attr='model', *, swap_3_4=False,
             mdl_elements[2], mdl_elements[3] = mdl_elements[3], mdl_elements[2]
         if len(types) == 5 and not no_flags:
             mdl_elements.append(MelUInt8Flags(types[4], 'model_flags',
-                self._ModelFlags))
-        super().__init__(attr, *mdl_elements)
+                cls._ModelFlags))
+        return mdl_elements
 
 #------------------------------------------------------------------------------
 # A distributor config for use with MelObjectTemplate, since MelObjectTemplate
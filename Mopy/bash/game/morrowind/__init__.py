@@ -148,7 +148,9 @@ def init(cls, _package_name=None):
         header_type.header_unpack = bolt.structs_cache['=4sIII'].unpack
         sub = _brec_.Subrecord
         sub.sub_header_fmt = '=4sI'
-        sub.sub_header_unpack = _struct.Struct(sub.sub_header_fmt).unpack
+        sub_struct = _struct.Struct(sub.sub_header_fmt)
+        sub.sub_header_unpack = sub_struct.unpack
+        sub.sub_header_unpack_from = sub_struct.unpack_from
         sub.sub_header_size = 8
         cls._import_records(__name__)
 
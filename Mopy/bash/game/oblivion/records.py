@@ -26,7 +26,8 @@
 
 from ...bolt import Flags, LowerDict, flag, int_or_none, int_or_zero, \
     sig_to_str, str_or_none, str_to_sig, structs_cache
-from ...brec import FID, AMelItems, AMelLLItems, AMreActor, AMreCell, \
+from ...brec import FID, AMelItems, AMelLLItems, AMelModel, \
+    AMreActor, AMreCell, \
     AMreHeader, AMreLeveledList, AMreRace, AMreWithItems, AMreWrld, AMreWthr, \
     AttrValDecider, BipedFlags, FlagDecider, MelActionFlags, MelActorSounds, \
     MelAnimations, MelArray, MelBase, MelBaseR, MelBodyParts, MelBookText, \
@@ -57,7 +58,7 @@
 #------------------------------------------------------------------------------
 # Record Elements -------------------------------------------------------------
 #------------------------------------------------------------------------------
-class MelModel(MelGroup):
+class MelModel(AMelModel):
     """Represents a model subrecord."""
     typeSets = {
         b'MODL': (b'MODL', b'MODB', b'MODT'),
@@ -67,12 +68,16 @@ class MelModel(MelGroup):
     }
 
     def __init__(self, mel_sig=b'MODL', attr='model'):
-        types = self.__class__.typeSets[mel_sig]
-        super().__init__(attr,
+        super().__init__(mel_sig, attr)
+
+    @classmethod
+    def _build_elements(cls, mel_sig):
+        types = cls.typeSets[mel_sig]
+        return [
             MelString(types[0], 'modPath'),
             MelFloat(types[1], 'modb'),
-            MelBase(types[2], 'modt_p') # Texture File Hashes
-        )
+            MelBase(types[2], 'modt_p'), # Texture File Hashes
+        ]
 
 #------------------------------------------------------------------------------
 # Common Flags
@@ -25,7 +25,8 @@
 
 from ... import bush
 from ...bolt import Flags, TrimmedFlags, flag, sig_to_str
-from ...brec import FID, AMelItems, AMelLLItems, AMelNvnm, AMelVmad, \
+from ...brec import FID, AMelItems, AMelLLItems, AMelModel, \
+    AMelNvnm, AMelVmad, \
     AMreActor, AMreCell, AMreFlst, AMreHeader, AMreImad, AMreLeveledList, \
     AMreRace, AMreWithItems, AMreWithKeywords, AMreWrld, AMreWthr, \
     ANvnmContext, AttrValDecider, AVmadContext, BipedFlags, FlagDecider, \
@@ -98,7 +99,7 @@ def sse_only(sse_obj):
 #------------------------------------------------------------------------------
 # Record Elements -------------------------------------------------------------
 #------------------------------------------------------------------------------
-class MelModel(MelGroup):
+class MelModel(AMelModel):
     """Represents a model subrecord."""
     # MODB and MODD are no longer used by TES5Edit
     typeSets = {
@@ -111,14 +112,18 @@ class MelModel(MelGroup):
     }
 
     def __init__(self, mel_sig=b'MODL', attr='model'):
-        types = self.__class__.typeSets[mel_sig]
-        super().__init__(attr,
+        super().__init__(mel_sig, attr)
+
+    @classmethod
+    def _build_elements(cls, mel_sig):
+        types = cls.typeSets[mel_sig]
+        return [
             MelString(types[0], 'modPath'),
-            # Ignore texture hashes - they're only an optimization, plenty
-            # of records in Skyrim.esm are missing them
+            # Ignore texture hashes - they're only an optimization, plenty of
+            # records in Skyrim.esm are missing them
             MelNull(types[1]),
-            MelMODS(types[2], 'alternateTextures')
-        )
+            MelMODS(types[2], 'alternateTextures'),
+        ]
 
 #------------------------------------------------------------------------------
 class _MelBodt(MelTruncatedStruct):
@@ -25,12 +25,14 @@
 
 from collections import defaultdict
 from collections.abc import Iterable
+from zlib import MAX_WBITS
 from zlib import decompress as zlib_decompress
+from zlib import decompressobj as zlib_decompressobj
 from zlib import error as zlib_error
 
 from . import bolt, bush, env
 from .bolt import MasterSet, SubProgress, decoder, deprint, sig_to_str, \
-    struct_error, GPath_no_norm, FName
+    struct_error, GPath_no_norm, FName, structs_cache
 # first import of brec for games with patchers - _dynamic_import_modules
 from .brec import ZERO_FID, FastModReader, FormIdReadContext, \
     FormIdWriteContext, MobBase, ModReader, MreRecord, RecHeader, \
@@ -44,29 +46,26 @@ class MasterMap(object):
     classes, but accepts both FormIds and short FormIDs (ints) -
     TODO refactor to drop those"""
     def __init__(self, inMasters, outMasters):
-        mast_map = {}
-        for i, master in enumerate(inMasters):
-            try:
-                mast_map[i] = outMasters.index(master)
-            except ValueError:
-                mast_map[i] = -1
-        self._mast_map = mast_map
-        self._out_masters = outMasters
+        # Map each input master index straight to the output master it
+        # resolves to, so that __call__ needs a single lookup - unmappable
+        # indices are left out. Masters are FNames, so look them up in the
+        # output masters to get those with the output list's casing
+        out_masters = {}
+        for out_master in outMasters:
+            out_masters.setdefault(out_master, out_master) # first one wins
+        self._mast_map = {i: out_masters[master] for i, master in
+                          enumerate(inMasters) if master in out_masters}
 
     def __call__(self, fid_to_map: FormId | int | None, dflt_fid=ZERO_FID):
         """Maps a fid from first set of masters to second. If no mapping is
         possible, then either returns default (if given) or raises
         MasterMapError."""
         if not fid_to_map: return fid_to_map
-        mod_dex_in = (int(fid_to_map >> 24) if isinstance(fid_to_map, int) else
-                      fid_to_map.mod_dex)
-        mod_dex_out = self._mast_map.get(mod_dex_in, -2)
-        if mod_dex_out >= 0:
-            mapped_object_dex = (
-                fid_to_map & 0xFFFFFF if isinstance(fid_to_map, int) else
-                fid_to_map.object_dex)
-            return FormId.from_tuple((self._out_masters[mod_dex_out],
-                                      mapped_object_dex))
+        fid_is_int = isinstance(fid_to_map, int)
+        mod_dex_in = fid_to_map >> 24 if fid_is_int else fid_to_map.mod_dex
+        if (out_master := self._mast_map.get(mod_dex_in)) is not None:
+            return FormId.from_tuple((out_master, fid_to_map & 0xFFFFFF
+                if fid_is_int else fid_to_map.object_dex))
         elif dflt_fid != ZERO_FID:
             return dflt_fid
         else:
@@ -385,16 +384,32 @@ class ModHeaderReader(object):
     """Allows very fast reading of a plugin's headers, skipping reading and
     decoding of anything but the headers."""
     @staticmethod
-    def _scan_fids(mod_info, fid_cond):
+    def _scan_fids(mod_info, fid_cond, *,
+                   __unpacker=structs_cache['=4sI4xI'].unpack_from):
+        """Return True if fid_cond returns True for the short FormID (an int)
+        of any record in the specified mod. Only used for ESL/Overlay checks,
+        so this assumes the TES4-style header layout (FormID at offset 12)."""
+        # Only unpack signature, size and FormID of each header - building
+        # full RecHeaders and FormIds is much slower
+        rec_head_size = RecordHeader.rec_header_size
+        valid_sigs = RecHeader.valid_record_sigs
         with ModReader.from_info(mod_info) as ins:
+            ins_at_end = ins.atEnd
+            ins_unpack = ins.unpack
+            ins_seek = ins.seek
             try:
-                while not ins.atEnd():
-                    next_header = unpack_header(ins)
+                while not ins_at_end():
+                    rec_sig, blob_size, short_fid = ins_unpack(__unpacker,
+                        rec_head_size, 'REC_HEADER')
                     # Skip GRUPs themselves, only process their records
-                    if next_header.recType != b'GRUP':
-                        if fid_cond(next_header.fid):
-                            return True
-                        next_header.skip_blob(ins)
+                    if rec_sig == b'GRUP':
+                        continue
+                    if rec_sig not in valid_sigs:
+                        raise ModError(ins.inName, f'Bad header signature: '
+                                                   f'{sig_to_str(rec_sig)}')
+                    if fid_cond(short_fid):
+                        return True
+                    ins_seek(blob_size, 1, rec_sig)
             except (OSError, struct_error) as e:
                 raise ModError(ins.inName, f"Error scanning {mod_info}, file "
                     f"read pos: {ins.tell():d}\nCaused by: '{e!r}'")
@@ -405,8 +420,8 @@ def formids_in_esl_range(mod_info):
         """Checks if all FormIDs in the specified mod are in the ESL range."""
         num_masters = len(mod_info.masterNames)
         return not ModHeaderReader._scan_fids(mod_info,
-            lambda header_fid: header_fid.mod_dex >= num_masters and
-                               header_fid.object_dex > 0xFFF)
+            lambda short_fid: short_fid >> 24 >= num_masters and
+                              short_fid & 0xFFFFFF > 0xFFF)
 
     @staticmethod
     def has_new_records(mod_info):
@@ -414,18 +429,24 @@ def has_new_records(mod_info):
         num_masters = len(mod_info.masterNames)
         # Check for NULL to skip the main file header (i.e. TES3/TES4)
         return ModHeaderReader._scan_fids(mod_info,
-            lambda header_fid: not header_fid.is_null() and
-                               header_fid.mod_dex >= num_masters)
+            lambda short_fid: short_fid & 0xFFFFFF != 0 and
+                              short_fid >> 24 >= num_masters)
 
     @staticmethod
-    def extract_mod_data(mod_info, progress, *, __unpacker=int_unpacker):
+    def extract_mod_data(mod_info, progress, *, validate=True,
+            __unpacker=int_unpacker,
+            __unpacker_from=structs_cache['I'].unpack_from):
         """Reads the headers and EDIDs of every record in the specified mod,
         returning them as a dict, mapping record signature to a dict mapping
         FormIDs to a list of tuples containing the headers and EDIDs of every
         record with that signature. Note that the flags are not processed
         either - if you need that, manually call MreRecord.flags1_() on them.
+        If validate is False, compressed records that start with an EDID are
+        only decompressed as far as needed to read it, so their decompressed
+        size and the rest of their zlib data are not checked. Only pass that
+        if you don't need corrupted records to be reported.
 
-        :rtype: defaultdict[bytes, defaultdict[int, tuple[RecHeader, str]]]"""
+        :rtype: dict[bytes, dict[FormId, tuple[RecHeader, str]]]"""
         # This method is *heavily* optimized for performance. Inlines and other
         # ugly code ahead
         progress = progress or bolt.Progress()
@@ -435,15 +456,15 @@ def extract_mod_data(mod_info, progress, *, __unpacker=int_unpacker):
         avoided_encodings = (u'utf8', u'utf-8')
         minf_size = mod_info.fsize
         plugin_fn = mod_info.fn_key
-        sh_unpack = Subrecord.sub_header_unpack
+        sh_unpack_from = Subrecord.sub_header_unpack_from
         sh_size = Subrecord.sub_header_size
         main_progress_msg = _(u'Loading: %s') % plugin_fn
         # Where we'll store all the collected record data
-        group_records = defaultdict(lambda: defaultdict(tuple))
+        group_records = {}
         # The current top GRUP label - starts out as TES4/TES3
         tg_label = bush.game.Esp.plugin_header_sig
         # The dict we'll use to store records from the current top GRUP
-        records = group_records[tg_label]
+        records = group_records[tg_label] = {}
         ##: Uncomment these variables and the block below that uses them once
         # all of FO4's record classes have been written
         # The record types that can even contain EDIDs
@@ -472,7 +493,7 @@ def extract_mod_data(mod_info, progress, *, __unpacker=int_unpacker):
                     tg_label = next_header.label
                     progress(ins_tell() / minf_size,
                              f'{main_progress_msg}\n{sig_to_str(tg_label)}')
-                    records = group_records[tg_label]
+                    records = group_records.setdefault(tg_label, {})
                 #     skip_eids = tg_label not in records_with_eids
                 # elif skip_eids:
                 #     # This record type has no EDIDs, skip directly to the next
@@ -487,9 +508,39 @@ def extract_mod_data(mod_info, progress, *, __unpacker=int_unpacker):
                     next_record = ins_tell() + blob_siz
                     if next_header.flags1 & 0x00040000: # 'compressed' flag
                         size_check = __unpacker(ins_read(4))[0]
+                        comp_data = ins_read(blob_siz - 4)
+                        # The EDID, if any, is the first subrecord - if we
+                        # don't have to validate the record, try to get it
+                        # from just the start of the record instead of
+                        # decompressing all of it
+                        if validate:
+                            rec_start = b''
+                        else:
+                            try:
+                                rec_start = zlib_decompressobj().decompress(
+                                    comp_data, 512)
+                            except zlib_error:
+                                rec_start = b'' # let the full path handle it
+                        if (rec_start[:4] == b'EDID' and
+                                len(rec_start) >= sh_size):
+                            eid_end = sh_size + sh_unpack_from(rec_start)[1]
+                            if len(rec_start) >= eid_end:
+                                eid_bytes = rec_start[sh_size:eid_end].rstrip(
+                                    null1)
+                                try: # see below
+                                    eid = eid_bytes.decode('ascii')
+                                except UnicodeDecodeError:
+                                    eid = decoder(eid_bytes, wanted_encoding,
+                                                  avoided_encodings)
+                                records[next_header.fid] = (next_header, eid)
+                                continue
                         try:
-                            new_rec_data = zlib_decompress(ins_read(
-                                blob_siz - 4))
+                            # Size the output buffer up front so zlib does not
+                            # have to keep growing it - capped at deflate's
+                            # maximum ratio in case size_check is garbage
+                            new_rec_data = zlib_decompress(comp_data,
+                                MAX_WBITS, min(size_check,
+                                               len(comp_data) * 1032))
                         except zlib_error:
                             if plugin_fn == u'FalloutNV.esm':
                                 # Yep, FalloutNV.esm has a record with broken
@@ -503,36 +554,46 @@ def extract_mod_data(mod_info, progress, *, __unpacker=int_unpacker):
                                 f'{size_check}, got {len(new_rec_data)}.')
                     else:
                         new_rec_data = ins_read(blob_siz)
-                    fmr = FastModReader(plugin_fn, new_rec_data)
-                    fmr_seek = fmr.seek
-                    fmr_read = fmr.read
-                    fmr_tell = fmr.tell
-                    fmr_size = fmr.size
-                    fmr_unpack = fmr.unpack
-                    while fmr_tell() != fmr_size:
+                    # Walk the subrecords directly over the record's bytes,
+                    # unpacking at an offset instead of read()ing each header
+                    rec_pos = 0
+                    rec_size = len(new_rec_data)
+                    while rec_pos != rec_size:
                         # Inlined from unpackSubHeader & FastModReader.unpack
-                        read_data = fmr_read(sh_size)
-                        if len(read_data) != sh_size:
-                            raise ModReadError(
-                                plugin_fn, [_rsig, u'SUB_HEAD'],
-                                fmr_tell() - len(read_data), fmr_size)
-                        mel_sig, mel_size = sh_unpack(read_data)
+                        if rec_pos + sh_size > rec_size:
+                            raise ModReadError(plugin_fn, [_rsig, 'SUB_HEAD'],
+                                               rec_pos, rec_size)
+                        mel_sig, mel_size = sh_unpack_from(new_rec_data,
+                                                           rec_pos)
+                        rec_pos += sh_size
                         # Extended storage - very rare, so don't optimize
                         # inlines etc. for it
                         if mel_sig == b'XXXX':
+                            if rec_pos + 4 + sh_size > rec_size:
+                                raise ModReadError(plugin_fn, [_rsig, 'XXXX'],
+                                                   rec_pos, rec_size)
                             # Throw away size here (always == 0)
-                            mel_size = fmr_unpack(__unpacker, 4, _rsig,
-                                                  'XXXX.SIZE')[0]
-                            mel_sig = fmr_unpack(sh_unpack, sh_size,
-                                                 _rsig, 'XXXX.TYPE')[0]
+                            mel_size = __unpacker_from(new_rec_data,
+                                                       rec_pos)[0]
+                            mel_sig = sh_unpack_from(new_rec_data,
+                                                     rec_pos + 4)[0]
+                            rec_pos += 4 + sh_size
                         if mel_sig == b'EDID':
                             # No need to worry about newlines, these are Editor
                             # IDs and so won't contain any
-                            eid = decoder(fmr_read(mel_size).rstrip(null1),
-                                          wanted_encoding, avoided_encodings)
+                            eid_bytes = new_rec_data[
+                                rec_pos:rec_pos + mel_size].rstrip(null1)
+                            # They are almost always plain ASCII too, which
+                            # every plugin encoding we support agrees on - so
+                            # only fall back to the decoder's heuristics (and
+                            # chardet) if that fails
+                            try:
+                                eid = eid_bytes.decode('ascii')
+                            except UnicodeDecodeError:
+                                eid = decoder(eid_bytes, wanted_encoding,
+                                              avoided_encodings)
                             break
-                        else:
-                            fmr_seek(mel_size, 1)
+                        rec_pos += mel_size
                     records[next_header.fid] = (next_header, eid)
                     ins_seek(next_record) # we may have break'd at EDID
         del group_records[bush.game.Esp.plugin_header_sig] # skip TES4 record
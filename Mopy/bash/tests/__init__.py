@@ -156,3 +156,82 @@ def _emulate_startup():
         set_game('Oblivion (Steam)')
 
 _emulate_startup()
+
+# Synthetic plugins -----------------------------------------------------------
+# Imported only now, since these need the translations set up by
+# _emulate_startup
+import struct as _struct
+import zlib as _zlib
+
+from ..bolt import FName as _FName
+from ..bolt import GPath as _GPath
+from ..bolt import structs_cache as _structs_cache
+from ..brec import RecordHeader as _RecordHeader
+from ..brec import Subrecord as _Subrecord
+
+def _header_padding():
+    """Return the bytes that pad a record or group header from the 16 bytes
+    all games share to the current game's header size."""
+    return b'\x00' * (_RecordHeader.rec_header_size - 16)
+
+def plugin_subrecord(sub_sig: bytes, sub_data: bytes) -> bytes:
+    """Return the bytes of a subrecord with the specified signature and data,
+    preceded by an XXXX subrecord if the data is too big for a regular one.
+    Uses whatever subrecord header format the last initialized game set."""
+    pack_sub_header = _structs_cache[_Subrecord.sub_header_fmt].pack
+    if len(sub_data) > 0xFFFF:
+        return (pack_sub_header(b'XXXX', 4) +
+                _struct.pack('=I', len(sub_data)) +
+                pack_sub_header(sub_sig, 0) + sub_data)
+    return pack_sub_header(sub_sig, len(sub_data)) + sub_data
+
+def plugin_record(rec_sig: bytes, short_fid: int, rec_data: bytes,
+                  flags1=0) -> bytes:
+    """Return the bytes of a record with the specified signature, FormID and
+    (uncompressed) data. If flags1 has the compressed flag set, the data is
+    compressed."""
+    if flags1 & 0x00040000:
+        rec_data = _struct.pack('=I', len(rec_data)) + _zlib.compress(
+            rec_data)
+    return (rec_sig + _struct.pack('=3I', len(rec_data), flags1, short_fid) +
+            _header_padding() + rec_data)
+
+def plugin_group(grup_label: bytes, group_type: int,
+                 grup_data: bytes) -> bytes:
+    """Return the bytes of a group with the specified label (already packed),
+    group type and contents."""
+    return (b'GRUP' + _struct.pack('=I', len(grup_data) +
+                                   _RecordHeader.rec_header_size) +
+            grup_label + _struct.pack('=i', group_type) + _header_padding() +
+            grup_data)
+
+def plugin_header(*masters: str) -> bytes:
+    """Return the bytes of a plugin header record with the specified
+    masters."""
+    hedr_data = _struct.pack('=f2I', 1.0, 0, 0x800)
+    masters_data = b''.join(
+        plugin_subrecord(b'MAST', f'{m}\x00'.encode('ascii')) +
+        plugin_subrecord(b'DATA', b'\x00' * 8) for m in masters)
+    return plugin_record(bush.game.Esp.plugin_header_sig, 0,
+        plugin_subrecord(b'HEDR', hedr_data) + masters_data)
+
+class FakeModInfo(object):
+    """Just enough of a ModInfo to read and write the plugin at the specified
+    path."""
+    def __init__(self, plugin_path, masters=()):
+        self.abs_path = _GPath(plugin_path)
+        self.fn_key = _FName(self.abs_path.stail)
+        self.masterNames = tuple(map(_FName, masters))
+
+    @property
+    def fsize(self):
+        return self.abs_path.psize
+
+    def getPath(self):
+        return self.abs_path
+
+    def makeBackup(self):
+        pass
+
+    def setmtime(self, set_time=0.0, crc_changed=False):
+        pass
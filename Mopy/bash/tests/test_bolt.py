@@ -24,9 +24,10 @@
 
 import pytest
 
-from ..bolt import CIstr, DefaultFNDict, DefaultLowerDict, FName, FNDict, \
-    GPath, GPath_no_norm, LooseVersion, LowerDict, OrderedLowerDict, Path, \
-    Rounder, SigToStr, StrToSig, decoder, encode, getbestencoding, os_name
+from ..bolt import CIstr, DefaultFNDict, DefaultLowerDict, Flags, FName, \
+    FNDict, GPath, GPath_no_norm, LooseVersion, LowerDict, OrderedLowerDict, \
+    Path, Rounder, SigToStr, StrToSig, TrimmedFlags, decoder, encode, flag, \
+    getbestencoding, os_name
 
 def test_getbestencoding():
     """Tests getbestencoding. Keep this one small, we don't want to test
@@ -478,6 +479,43 @@ def test__eq__(self):
         assert not (rounder_5th == True)
         assert not (rounder_5th == 55)
 
+class TestFlags:
+    class _BaseFlags(Flags):
+        flag_a: bool
+        flag_b: bool = flag(4)
+        flag_skipped: bool = flag(None)
+        flag_c: bool
+
+    class _ChildFlags(_BaseFlags):
+        flag_d: bool
+
+    class _ChildTrimmedFlags(_BaseFlags, TrimmedFlags):
+        pass
+
+    def test_indices(self):
+        assert self._BaseFlags._names == {'flag_a': 0, 'flag_b': 4,
+                                          'flag_c': 6}
+        # Subclasses must see the declarations of their parents, not the
+        # properties created for them
+        assert self._ChildFlags._names == {'flag_a': 0, 'flag_b': 4,
+                                           'flag_c': 6, 'flag_d': 7}
+
+    def test_get_set(self):
+        test_flags = self._ChildFlags(0b10010001)
+        assert test_flags.flag_a
+        assert test_flags.flag_b
+        assert not test_flags.flag_c
+        assert test_flags.flag_d
+        test_flags.flag_a = False
+        test_flags.flag_c = True
+        assert int(test_flags) == 0b11010000
+        assert test_flags.getTrueAttrs() == ('flag_b', 'flag_c', 'flag_d')
+        with pytest.raises(KeyError):
+            test_flags.not_a_flag = True
+
+    def test_trimmed(self):
+        assert self._ChildTrimmedFlags(0b11111111).dump() == 0b1010001
+
 class TestLooseVersion:
     def test_repr(self):
         """Tests that parsing and __repr__ work correctly."""
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# GPL License and Copyright Notice ============================================
+#  This file is part of Wrye Bash.
+#
+#  Wrye Bash is free software: you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  Wrye Bash is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with Wrye Bash.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  Wrye Bash copyright (C) 2005-2009 Wrye, 2010-2023 Wrye Bash Team
+#  https://github.com/wrye-bash
+#
+# =============================================================================
+import struct
+
+import pytest
+
+from .. import FakeModInfo, plugin_group, plugin_header, plugin_record, \
+    plugin_subrecord
+from ... import load_order
+from ...bolt import Progress
+from ...brec import RecordHeader
+from ...bosh import mods_metadata
+from ...bosh.mods_metadata import NvidiaFogFixer, checkMods
+
+_DELETED = 0x00000020
+
+@pytest.fixture(autouse=True)
+def _no_form_version(monkeypatch):
+    """The synthetic plugins below are Oblivion plugins, which have no form
+    version - but games initialized earlier by _emulate_startup may have left
+    theirs behind."""
+    monkeypatch.setattr(RecordHeader, 'plugin_form_version', 0)
+
+def _edid(eid: str) -> bytes:
+    return plugin_subrecord(b'EDID', f'{eid}\x00'.encode('ascii'))
+
+def _cell_top_group(*cell_blocks):
+    """Wrap the specified CELL records and children groups in a single block
+    and sub-block of the CELL top group."""
+    return plugin_group(b'CELL', 0, plugin_group(b'\x00' * 4, 2,
+        plugin_group(b'\x00' * 4, 3, b''.join(cell_blocks))))
+
+def _cell_children(cell_fid, *child_records):
+    return plugin_group(struct.pack('=I', cell_fid), 6, b''.join(
+        child_records))
+
+class _NoProgress(Progress):
+    def _do_progress(self, state, message):
+        pass
+
+# NvidiaFogFixer --------------------------------------------------------------
+def _xcll(fog_near, fog_far, fog_clip) -> bytes:
+    return plugin_subrecord(b'XCLL', struct.pack('=12s2f12sf', b'c' * 12,
+        fog_near, fog_far, b'd' * 12, fog_clip))
+
+def _fog_plugin(first_xcll):
+    # A MISC group big enough to be copied in several chunks, a cell that may
+    # need fixing with a reference in it and a cell that never needs fixing
+    return plugin_header() + plugin_group(b'MISC', 0, plugin_record(
+        b'MISC', 0x800, _edid('Misc') + plugin_subrecord(
+            b'DATA', bytes(range(200))))) + _cell_top_group(
+        plugin_record(b'CELL', 0x801, _edid('FogCell') + first_xcll),
+        _cell_children(0x801, plugin_record(b'REFR', 0x802,
+            _edid('Ref') + _xcll(0, 0, 0))),
+        plugin_record(b'CELL', 0x803, _edid('FineCell') + _xcll(1, 2, 3)))
+
+def test_fix_fog(tmp_path, monkeypatch):
+    """Tests that fix_fog only changes the fog near value of cells with no
+    fog at all and leaves every other byte alone."""
+    monkeypatch.setattr(mods_metadata, '_FOG_COPY_CHUNK', 64)
+    plugin_path = tmp_path / 'Fog.esp'
+    plugin_path.write_bytes(_fog_plugin(_xcll(0, 0, 0)))
+    fog_fixer = NvidiaFogFixer(FakeModInfo(plugin_path))
+    fog_fixer.fix_fog(_NoProgress())
+    assert [f.short_fid for f in fog_fixer.fixedCells] == [0x801]
+    assert plugin_path.read_bytes() == _fog_plugin(_xcll(0.0001, 0, 0))
+
+def test_fix_fog_unchanged(tmp_path):
+    """Tests that fix_fog leaves plugins without broken fog alone."""
+    plugin_path = tmp_path / 'Fog.esp'
+    plugin_path.write_bytes(orig_data := _fog_plugin(_xcll(0, 0.5, 0)))
+    fog_fixer = NvidiaFogFixer(FakeModInfo(plugin_path))
+    fog_fixer.fix_fog(_NoProgress())
+    assert not fog_fixer.fixedCells
+    assert plugin_path.read_bytes() == orig_data
+
+# checkMods -------------------------------------------------------------------
+class _CheckModInfo(FakeModInfo):
+    """A FakeModInfo with everything checkMods needs."""
+    class _Header(object):
+        version = 1.0
+
+    header = _Header()
+
+    def getBashTags(self):
+        return set()
+
+    def has_circular_masters(self):
+        return False
+
+    def getDirtyMessage(self, scan_beth=False):
+        return ''
+
+    def is_esl(self):
+        return False
+
+    def is_overlay(self):
+        return False
+
+class _CheckModInfos(dict):
+    """Just enough of ModInfos for checkMods."""
+    def __init__(self, *minfs):
+        super().__init__((m.fn_key, m) for m in minfs)
+        self.corrupted = {}
+        self.merged = set()
+        self.imported = set()
+        self.older_form_versions = set()
+        self.mergeable_plugins = set()
+        self.esl_capable_plugins = set()
+        self.overlay_capable_plugins = set()
+
+def test_check_mods(tmp_path, monkeypatch):
+    """Tests that checkMods reports record type collisions and deleted
+    references."""
+    master_path = tmp_path / 'Master.esm'
+    master_path.write_bytes(plugin_header() + plugin_group(
+        b'MISC', 0, plugin_record(b'MISC', 0x800, _edid('MasterRec'))) +
+        _cell_top_group(plugin_record(b'CELL', 0x801, _edid('MasterCell')),
+            _cell_children(0x801, plugin_record(b'REFR', 0x802,
+                                                _edid('MasterRef')))))
+    plugin_path = tmp_path / 'Plugin.esp'
+    # Overrides the MISC record with a WEAP one and deletes the reference
+    plugin_path.write_bytes(plugin_header('Master.esm') + plugin_group(
+        b'WEAP', 0, plugin_record(b'WEAP', 0x800, _edid('MasterRec'))) +
+        _cell_top_group(plugin_record(b'CELL', 0x801, _edid('MasterCell')),
+            _cell_children(0x801, plugin_record(b'REFR', 0x802, b'',
+                                                _DELETED))))
+    test_minfs = _CheckModInfos(_CheckModInfo(master_path),
+                                _CheckModInfo(plugin_path, ['Master.esm']))
+    test_lo = tuple(test_minfs)
+    monkeypatch.setattr(load_order, 'cached_lo_tuple', lambda: test_lo)
+    monkeypatch.setattr(load_order, 'cached_active_tuple', lambda: test_lo)
+    check_report = checkMods(_NoProgress(), test_minfs)
+    assert 'Record Type Collisions' in check_report
+    assert 'MISC' in check_report and 'WEAP' in check_report
+    assert '__Plugin.esp:__  1 deleted reference' in check_report
+    assert '__Master.esm:__' not in check_report
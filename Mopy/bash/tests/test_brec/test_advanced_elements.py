@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# GPL License and Copyright Notice ============================================
+#  This file is part of Wrye Bash.
+#
+#  Wrye Bash is free software: you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  Wrye Bash is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with Wrye Bash.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  Wrye Bash copyright (C) 2005-2009 Wrye, 2010-2023 Wrye Bash Team
+#  https://github.com/wrye-bash
+#
+# =============================================================================
+import io
+import struct
+
+from ...brec import FID, MelFid, MelFloat, MelObject, MelSimpleArray, \
+    MelUInt16, MelUInt32, ModReader
+
+def _load_array(array_element, raw_data):
+    """Loads raw_data via the specified MelSimpleArray and returns the loaded
+    array, plus the same data loaded one entry at a time via the array's
+    element."""
+    test_record = MelObject()
+    array_element.setDefault(test_record)
+    entry_element = array_element._element
+    entry_size = entry_element.static_size
+    with ModReader('test.esp', io.BytesIO(raw_data)) as ins:
+        array_element.load_mel(test_record, ins, b'TEST', len(raw_data))
+        ins.seek(0)
+        per_entry = [entry_element.load_bytes(ins, entry_size) for _x in
+                     range(len(raw_data) // entry_size)]
+    return getattr(test_record, array_element.attr), per_entry
+
+class TestMelSimpleArray(object):
+    def test_load_fids(self):
+        """Tests that an array of FormIDs loads in bulk and matches loading
+        each FormID on its own."""
+        fids_array = MelSimpleArray('test_fids', MelFid(b'TEST'))
+        assert fids_array._simple_action is FID
+        raw_fids = (0x01000800, 0x00000014, 0x0200ABCD, 0)
+        loaded, per_entry = _load_array(
+            fids_array, struct.pack('=4I', *raw_fids))
+        assert loaded == per_entry
+        assert [f.short_fid for f in loaded] == list(raw_fids)
+
+    def test_load_floats(self):
+        """Tests that an array of floats loads in bulk and matches loading
+        each float on its own, including the rounding."""
+        floats_array = MelSimpleArray('test_floats', MelFloat(b'TEST'))
+        assert floats_array._simple_iter_unpack is not None
+        loaded, per_entry = _load_array(
+            floats_array, struct.pack('=3f', 0.1, -2.5, 1e10))
+        assert loaded == per_entry
+        assert all(type(f) is type(e) for f, e in zip(loaded, per_entry))
+
+    def test_load_ints(self):
+        """Tests that an array of plain ints loads in bulk and matches loading
+        each int on its own."""
+        ints_array = MelSimpleArray('test_ints', MelUInt16(b'TEST'))
+        loaded, per_entry = _load_array(
+            ints_array, struct.pack('=3H', 1, 2, 65535))
+        assert loaded == per_entry == [1, 2, 65535]
+
+    def test_load_subclass(self):
+        """Tests that elements with their own load_bytes are not unpacked in
+        bulk."""
+        class _MelDoubledUInt32(MelUInt32):
+            def load_bytes(self, ins, size_, *debug_strs):
+                return super().load_bytes(ins, size_, *debug_strs) * 2
+        doubled_array = MelSimpleArray('test_doubled',
+                                       _MelDoubledUInt32(b'TEST'))
+        assert doubled_array._simple_iter_unpack is None
+        loaded, per_entry = _load_array(
+            doubled_array, struct.pack('=2I', 3, 5))
+        assert loaded == per_entry == [6, 10]
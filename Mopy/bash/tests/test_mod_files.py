@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+# GPL License and Copyright Notice ============================================
+#  This file is part of Wrye Bash.
+#
+#  Wrye Bash is free software: you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  Wrye Bash is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with Wrye Bash.  If not, see <https://www.gnu.org/licenses/>.
+#
+#  Wrye Bash copyright (C) 2005-2009 Wrye, 2010-2023 Wrye Bash Team
+#  https://github.com/wrye-bash
+#
+# =============================================================================
+import struct
+
+import pytest
+
+from . import FakeModInfo, plugin_group, plugin_header, plugin_record, \
+    plugin_subrecord
+from ..exception import ModError
+from ..mod_files import ModHeaderReader
+
+_COMPRESSED = 0x00040000
+
+def _edid(eid: str) -> bytes:
+    return plugin_subrecord(b'EDID', f'{eid}\x00'.encode('ascii'))
+
+# Big enough that it needs an XXXX subrecord
+_big_data = plugin_subrecord(b'DATA', b'x' * 70000)
+
+def _write_plugin(tmp_path, plugin_name, plugin_data, masters=()):
+    plugin_path = tmp_path / plugin_name
+    plugin_path.write_bytes(plugin_data)
+    return FakeModInfo(plugin_path, masters)
+
+def _misc_group(*misc_records):
+    return plugin_group(b'MISC', 0, b''.join(misc_records))
+
+# extract_mod_data ------------------------------------------------------------
+_misc_eids = {
+    0x800: 'PlainRec',
+    0x801: 'CompressedRec',
+    0x802: 'CompressedLateEdid',
+    0x803: 'AfterXXXX',
+    0x804: 'CompressedAfterXXXX',
+    0x805: '',
+}
+
+def _extraction_plugin():
+    return plugin_header() + _misc_group(
+        plugin_record(b'MISC', 0x800, _edid(_misc_eids[0x800]) +
+                      plugin_subrecord(b'FULL', b'Plain\x00')),
+        plugin_record(b'MISC', 0x801, _edid(_misc_eids[0x801]) +
+                      plugin_subrecord(b'DATA', b'\x00' * 8), _COMPRESSED),
+        plugin_record(b'MISC', 0x802, plugin_subrecord(b'DATA', b'\x00' * 8) +
+                      _edid(_misc_eids[0x802]), _COMPRESSED),
+        plugin_record(b'MISC', 0x803, _big_data + _edid(_misc_eids[0x803])),
+        plugin_record(b'MISC', 0x804, _big_data + _edid(_misc_eids[0x804]),
+                      _COMPRESSED),
+        plugin_record(b'MISC', 0x805, plugin_subrecord(b'FULL', b'None\x00')),
+    )
+
+@pytest.mark.parametrize('validate', [True, False])
+def test_extract_mod_data(tmp_path, validate):
+    """Tests that extract_mod_data finds the EDIDs of plain and compressed
+    records, including ones that come after XXXX subrecords."""
+    minf = _write_plugin(tmp_path, 'Extract.esp', _extraction_plugin())
+    ext_data = ModHeaderReader.extract_mod_data(minf, None, validate=validate)
+    misc_data = ext_data[b'MISC']
+    assert {f.short_fid: e for f, (_h, e) in misc_data.items()} == _misc_eids
+    assert all(h.recType == b'MISC' for h, _e in misc_data.values())
+
+def test_extract_mod_data_mis_sized(tmp_path):
+    """Tests that extract_mod_data reports compressed records whose
+    decompressed size does not match the stored one."""
+    bad_rec = bytearray(plugin_record(b'MISC', 0x800, _edid('BadSize'),
+                                      _COMPRESSED))
+    # The decompressed size directly follows the record header
+    size_offset = len(plugin_record(b'MISC', 0x800, b''))
+    struct.pack_into('=I', bad_rec, size_offset, 4096)
+    minf = _write_plugin(tmp_path, 'MisSized.esp',
+                         plugin_header() + _misc_group(bytes(bad_rec)))
+    with pytest.raises(ModError):
+        ModHeaderReader.extract_mod_data(minf, None)
+
+# _scan_fids ------------------------------------------------------------------
+def _scan_plugin(tmp_path, *short_fids):
+    """Write a plugin with Master.esm as its master and a MISC record for each
+    of the specified FormIDs. The records alternate between being compressed
+    and containing XXXX subrecords, which the scan has to skip over."""
+    misc_records = [plugin_record(b'MISC', s, _edid(f'Rec{i}') + (
+        _big_data if i % 2 else b''), 0 if i % 2 else _COMPRESSED)
+                    for i, s in enumerate(short_fids)]
+    return _write_plugin(tmp_path, 'Scan.esp', plugin_header('Master.esm') +
+                         _misc_group(*misc_records), masters=('Master.esm',))
+
+def test_formids_in_esl_range(tmp_path):
+    """Tests formids_in_esl_range (and hence _scan_fids)."""
+    # Overrides can be outside the ESL range, new records can't
+    assert ModHeaderReader.formids_in_esl_range(
+        _scan_plugin(tmp_path, 0x00012345, 0x01000800, 0x01000FFF))
+    assert not ModHeaderReader.formids_in_esl_range(
+        _scan_plugin(tmp_path, 0x01000800, 0x00000800, 0x01001000))
+
+def test_has_new_records(tmp_path):
+    """Tests has_new_records (and hence _scan_fids)."""
+    assert not ModHeaderReader.has_new_records(
+        _scan_plugin(tmp_path, 0x00000800, 0x00012345))
+    assert ModHeaderReader.has_new_records(
+        _scan_plugin(tmp_path, 0x00000800, 0x00012345, 0x01000800))
+
+def test_scan_fids_bad_header(tmp_path):
+    """Tests that _scan_fids reports garbage instead of a record header."""
+    minf = _write_plugin(tmp_path, 'Garbage.esp', plugin_header() +
+                         _misc_group(b'JUNK' * 8), masters=())
+    with pytest.raises(ModError):
+        ModHeaderReader.has_new_records(minf)